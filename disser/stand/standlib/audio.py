@@ -0,0 +1,73 @@
+"""Tone synthesis and output stream helpers shared by commands and workers."""
+
+from functools import lru_cache
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import numpy as np
+    import sounddevice as sd
+
+
+# Samples per block in the angle-addition synthesis
+TONE_BLOCK = 1024
+
+
+def tone_buffer(n_samples: int) -> 'np.ndarray':
+    """Allocate a float32 buffer fill_tone can render n_samples into."""
+    import numpy as np
+
+    return np.empty(-(-n_samples // TONE_BLOCK) * TONE_BLOCK, dtype=np.float32)
+
+
+def fill_tone(frequency: float, n_samples: int, sample_rate: int,
+              out: 'np.ndarray', scratch: 'np.ndarray') -> 'np.ndarray':
+    """Render 0.5 * sin(omega * n) for n in [0, n_samples) into out.
+
+    Uses sin(a + b) = sin(a)cos(b) + cos(a)sin(b) over blocks, so only
+    TONE_BLOCK + n_samples / TONE_BLOCK trigonometric evaluations are needed.
+    Block angles are computed in float64, keeping the phase exact for long tones.
+    out and scratch come from tone_buffer(n_samples); the result is a view of out.
+    """
+    import numpy as np
+
+    omega = 2 * np.pi * frequency / sample_rate
+    blocks = -(-n_samples // TONE_BLOCK)
+    inner = omega * np.arange(TONE_BLOCK)
+    outer = (omega * TONE_BLOCK) * np.arange(blocks)
+
+    wave = out[:blocks * TONE_BLOCK].reshape(blocks, TONE_BLOCK)
+    term = scratch[:blocks * TONE_BLOCK].reshape(blocks, TONE_BLOCK)
+    np.multiply(np.sin(outer).astype(np.float32)[:, None], np.cos(inner).astype(np.float32), out=wave)
+    np.multiply(np.cos(outer).astype(np.float32)[:, None], np.sin(inner).astype(np.float32), out=term)
+    wave += term
+    wave = out[:n_samples]
+    wave *= np.float32(0.5)
+    return wave
+
+
+@lru_cache(maxsize=32)
+def make_tone(frequency: float, duration: float, sample_rate: int) -> 'np.ndarray':
+    """Return a cached sine wave buffer for the given tone parameters.
+
+    The returned array is float32, the sample format PortAudio plays, so no
+    conversion happens on submission. It is shared between callers and
+    marked read-only.
+    """
+    n_samples = int(sample_rate * duration)
+    wave = fill_tone(frequency, n_samples, sample_rate, tone_buffer(n_samples), tone_buffer(n_samples))
+    wave.setflags(write=False)
+    return wave
+
+
+def open_stream(sample_rate: int) -> 'sd.OutputStream':
+    """Open and start a float32 blocking output stream for the caller.
+
+    Every player owns its stream: the loop worker and console commands never
+    write to the same one, and only the owning thread stops, aborts or closes it.
+    """
+    import sounddevice as sd
+
+    stream = sd.OutputStream(samplerate=sample_rate, channels=1, dtype='float32',
+                             blocksize=2048, latency='high')
+    stream.start()
+    return stream
@@ -1,17 +1,137 @@
 """Camera operations: time sync and file fetch."""
 
 import datetime
+import errno
 import os
+import re
 import shutil
 import subprocess
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple, TYPE_CHECKING
+from typing import Callable, Dict, List, Optional, Tuple, TYPE_CHECKING
 
 if TYPE_CHECKING:
     from .config import ConfigManager
 
 
+# Per-file progress templates, bound once instead of rebuilt in the loops
+_COPY_FMT = "  [FETCH] [{i}/{n}] Copying {fn} ({mb:.1f} MB)...".format
+_COPIED_FMT = "  [FETCH] [{i}/{n}] Copied {fn} ({mb:.1f} MB)".format
+_RENAME_FMT = "  [RENAME] {fn} -> {new} (matched {ts})".format
+
+# Last successful gphoto2 auto-detect, reused briefly while the USB device set is unchanged
+_DETECT_TTL = 30.0
+_DETECT_CACHE = {'ts': 0.0, 'val': None, 'usb': None}
+_USB_DEVICES = '/sys/bus/usb/devices'
+
+
+def _usb_state() -> Optional[Tuple[str, ...]]:
+    """Snapshot of attached USB device names, None if sysfs is unavailable."""
+    try:
+        return tuple(sorted(os.listdir(_USB_DEVICES)))
+    except OSError:
+        return None
+
+
+def _next_whole_second() -> int:
+    """Sleep until the next wall-clock second and return it as a Unix timestamp.
+
+    The wait is timed on the monotonic clock, so an NTP step in between cannot
+    stretch it; the last 2 ms are spun for sub-millisecond alignment.
+    """
+    now = time.time()
+    target = int(now) + 1
+    deadline = time.monotonic() + (target - now)
+    time.sleep(max(0.0, deadline - time.monotonic() - 0.002))
+    while time.monotonic() < deadline:
+        pass
+    return target
+
+
+# Loop log line: "YYYY-MM-DD HH:MM:SS: frequency"
+_LOG_LINE_RE = re.compile(
+    rb'\s*(\d{4})-(\d{2})-(\d{2}) (\d{2}):(\d{2}):(\d{2}): ([-+]?(?:\d+\.?\d*|\.\d+))\s*$')
+
+# Renaming relative to an open directory fd skips re-resolving the parent path
+_RENAME_DIR_FD = os.rename in os.supports_dir_fd
+
+
+def _rename_in_dir(file_path: Path, new_name: str, dir_fds: Dict[Path, int]) -> None:
+    """Rename file within its own directory, reusing cached directory fds."""
+    parent = file_path.parent
+    if not _RENAME_DIR_FD:
+        os.rename(file_path, parent / new_name)
+        return
+    fd = dir_fds.get(parent)
+    if fd is None:
+        fd = os.open(parent, os.O_RDONLY | os.O_DIRECTORY)
+        dir_fds[parent] = fd
+    os.rename(file_path.name, new_name, src_dir_fd=fd, dst_dir_fd=fd)
+
+
+# In-kernel copies; these errnos mean the pair of filesystems cannot do it
+_HAS_COPY_FILE_RANGE = hasattr(os, 'copy_file_range')
+_COPY_RANGE_UNSUPPORTED = {errno.EXDEV, errno.ENOSYS, errno.EINVAL, errno.EOPNOTSUPP}
+
+
+def _copy_times(src: str, dst: str) -> None:
+    """Carry over only the file times; rename matching relies on the mtime."""
+    st = os.stat(src)
+    os.utime(dst, ns=(st.st_atime_ns, st.st_mtime_ns))
+
+
+def _fast_copy(src: str, dst: str) -> str:
+    """Copy src to dst with os.copy_file_range, falling back to shutil.copyfile.
+
+    Permissions and xattrs are not copied (camera mounts report bogus ones),
+    only access and modification times.
+    """
+    if not _HAS_COPY_FILE_RANGE:
+        shutil.copyfile(src, dst)
+        _copy_times(src, dst)
+        return dst
+    try:
+        src_fd = os.open(src, os.O_RDONLY)
+        try:
+            dst_fd = os.open(dst, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+            try:
+                while os.copy_file_range(src_fd, dst_fd, 1 << 30):
+                    pass
+            finally:
+                os.close(dst_fd)
+            st = os.fstat(src_fd)
+        finally:
+            os.close(src_fd)
+    except OSError as e:
+        if e.errno not in _COPY_RANGE_UNSUPPORTED:
+            raise
+        shutil.copyfile(src, dst)
+        _copy_times(src, dst)
+        return dst
+    os.utime(dst, ns=(st.st_atime_ns, st.st_mtime_ns))
+    return dst
+
+
+def _move(src: str, dst: str) -> str:
+    """Move src to dst on the same filesystem."""
+    os.rename(src, dst)
+    return dst
+
+
+def _bucket_log_entries(
+    log_entries: Dict[datetime.datetime, Tuple[float, str, float]]
+) -> Dict[int, List[Tuple[float, float, str, datetime.datetime]]]:
+    """Group log entries by whole epoch second for windowed lookups.
+
+    Each bucket keeps (epoch, frequency, ts_clean, timestamp) in log order.
+    """
+    buckets: Dict[int, List[Tuple[float, float, str, datetime.datetime]]] = {}
+    for log_ts, (freq, ts_clean, epoch) in log_entries.items():
+        buckets.setdefault(int(epoch), []).append((epoch, freq, ts_clean, log_ts))
+    return buckets
+
+
 class CameraSync:
     """Camera time synchronization using gphoto2."""
 
@@ -25,10 +145,15 @@ class CameraSync:
     @staticmethod
     def detect_camera() -> Optional[str]:
         """Detect camera via gphoto2. Returns camera name or None."""
+        usb = _usb_state()
+        if (usb is not None and usb == _DETECT_CACHE['usb']
+                and time.monotonic() - _DETECT_CACHE['ts'] < _DETECT_TTL):
+            return _DETECT_CACHE['val']
+
         try:
             result = subprocess.run(
                 ['gphoto2', '--auto-detect'],
-                capture_output=True, text=True, timeout=10
+                capture_output=True, timeout=10
             )
         except FileNotFoundError:
             print("  [SYNC] Error: gphoto2 not installed")
@@ -37,11 +162,18 @@ class CameraSync:
             print("  [SYNC] Error: gphoto2 timeout during detection")
             return None
 
-        lines = result.stdout.strip().split('\n')
-        cameras = [line for line in lines[2:] if line.strip()]
-        if cameras:
-            return cameras[0].strip()
-        return None
+        # Only the first camera line after the two header lines is needed
+        lines = result.stdout[:1024].decode('utf-8', 'replace').splitlines()
+        camera = None
+        for line in lines[2:]:
+            line = line.strip()
+            if line:
+                camera = line
+                break
+        # A miss may be transient (camera waking, port busy), so only hits are kept
+        if camera:
+            _DETECT_CACHE.update(ts=time.monotonic(), val=camera, usb=usb)
+        return camera
 
     @staticmethod
     def sync_time() -> bool:
@@ -64,18 +196,19 @@ class CameraSync:
             print("  [SYNC] Trying: gphoto2 --set-config datetime=now")
             result = subprocess.run(
                 ['gphoto2', '--set-config', 'datetime=now'],
-                capture_output=True, text=True, timeout=15
+                stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, timeout=15
             )
             if result.returncode == 0:
                 print("  [SYNC] Success: Camera time synchronized")
                 return True
 
-            # Try alternative: set datetime as unix timestamp
-            timestamp = int(time.time())
+            # Try alternative: set datetime as unix timestamp, sent on the second
+            # it names instead of truncating up to a second off the host clock
+            timestamp = _next_whole_second()
             print(f"  [SYNC] Trying: gphoto2 --set-config-value /main/settings/datetime={timestamp}")
             result = subprocess.run(
                 ['gphoto2', '--set-config-value', f'/main/settings/datetime={timestamp}'],
-                capture_output=True, text=True, timeout=15
+                stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, timeout=15
             )
             if result.returncode == 0:
                 print("  [SYNC] Success: Camera time synchronized")
@@ -85,15 +218,17 @@ class CameraSync:
             print("  [SYNC] Trying: gphoto2 --set-config syncdatetime=1")
             result = subprocess.run(
                 ['gphoto2', '--set-config', 'syncdatetime=1'],
-                capture_output=True, text=True, timeout=15
+                stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, timeout=15
             )
             if result.returncode == 0:
                 print("  [SYNC] Success: Camera time synchronized")
                 return True
 
             print("  [SYNC] Error: All methods failed")
-            if result.stderr.strip():
-                print(f"  [SYNC] Last error: {result.stderr.strip()}")
+            # Only the return codes matter until here; decode stderr just for this report
+            stderr = result.stderr.decode(errors='replace').strip()
+            if stderr:
+                print(f"  [SYNC] Last error: {stderr}")
             return False
 
         except subprocess.TimeoutExpired:
@@ -106,6 +241,31 @@ class CameraMount:
 
     EXTENSIONS = {'.jpg', '.jpeg', '.png', '.cr2', '.cr3', '.nef',
                   '.arw', '.raw', '.dng', '.mp4', '.mov', '.avi'}
+    # Extensions without the dot, lower- and upper-case, matched against the raw suffix
+    _EXT_NO_DOT = frozenset(e[1:] for e in EXTENSIONS) | frozenset(e[1:].upper() for e in EXTENSIONS)
+
+    @staticmethod
+    def _subdirs(base: str) -> List[os.DirEntry]:
+        """List subdirectory entries of base, empty if it cannot be read."""
+        try:
+            with os.scandir(base) as it:
+                return [e for e in it if e.is_dir()]
+        except OSError:
+            return []
+
+    @staticmethod
+    def _has_dcim(path: str) -> bool:
+        """Check for a DCIM directory among the entries of path in one scan."""
+        try:
+            with os.scandir(path) as it:
+                return any(e.name == 'DCIM' and e.is_dir() for e in it)
+        except OSError:
+            return False
+
+    @staticmethod
+    def is_gvfs(path: Path) -> bool:
+        """Check whether path lies on a gvfs (PTP/MTP) mount."""
+        return str(path).startswith(f'/run/user/{os.getuid()}/gvfs')
 
     @staticmethod
     def find_mount() -> Optional[Path]:
@@ -113,61 +273,64 @@ class CameraMount:
         # Check gvfs first (for PTP/MTP cameras)
         uid = os.getuid()
         gvfs_path = f'/run/user/{uid}/gvfs'
-        if os.path.exists(gvfs_path):
-            try:
-                for mount in os.listdir(gvfs_path):
-                    if 'gphoto2' in mount or 'mtp' in mount:
-                        mount_path = os.path.join(gvfs_path, mount)
-                        if os.path.isdir(mount_path):
-                            # Check for DCIM directly or inside subdirs
-                            dcim = os.path.join(mount_path, 'DCIM')
-                            if os.path.exists(dcim):
-                                return Path(mount_path)
-                            # Some cameras have storage folders
-                            for subdir in os.listdir(mount_path):
-                                subpath = os.path.join(mount_path, subdir)
-                                if os.path.isdir(subpath):
-                                    dcim = os.path.join(subpath, 'DCIM')
-                                    if os.path.exists(dcim):
-                                        return Path(subpath)
-            except PermissionError:
-                pass
+        for mount in CameraMount._subdirs(gvfs_path):
+            if 'gphoto2' in mount.name or 'mtp' in mount.name:
+                # Check for DCIM directly or inside subdirs
+                if CameraMount._has_dcim(mount.path):
+                    return Path(mount.path)
+                # Some cameras have storage folders
+                for storage in CameraMount._subdirs(mount.path):
+                    if CameraMount._has_dcim(storage.path):
+                        return Path(storage.path)
 
         # Check common mount points
         media_dirs = ['/media', '/mnt', '/run/media']
         user = os.environ.get('USER', '')
 
         for base in media_dirs:
-            if not os.path.exists(base):
-                continue
-            # Check /media/USER/ pattern
-            user_media = os.path.join(base, user)
-            if os.path.exists(user_media):
-                for mount in os.listdir(user_media):
-                    mount_path = os.path.join(user_media, mount)
-                    if os.path.isdir(mount_path):
-                        dcim = os.path.join(mount_path, 'DCIM')
-                        if os.path.exists(dcim):
-                            return Path(mount_path)
-            # Check base directly
-            for mount in os.listdir(base):
-                mount_path = os.path.join(base, mount)
-                if os.path.isdir(mount_path):
-                    dcim = os.path.join(mount_path, 'DCIM')
-                    if os.path.exists(dcim):
-                        return Path(mount_path)
+            # Check /media/USER/ pattern, then base directly
+            for parent in (os.path.join(base, user), base):
+                for mount in CameraMount._subdirs(parent):
+                    if CameraMount._has_dcim(mount.path):
+                        return Path(mount.path)
         return None
 
     @staticmethod
     def find_files(camera_path: Path) -> List[Path]:
         """Find all image/video files on camera."""
+        return [Path(p) for p in CameraMount.find_file_paths(camera_path)]
+
+    @staticmethod
+    def find_file_paths(camera_path: Path) -> List[str]:
+        """Find all image/video files on camera as sorted path strings."""
         files = []
         dcim = camera_path / 'DCIM'
-        if dcim.exists():
-            for root, dirs, filenames in os.walk(dcim):
-                for f in filenames:
-                    if os.path.splitext(f)[1].lower() in CameraMount.EXTENSIONS:
-                        files.append(Path(root) / f)
+        if not dcim.exists():
+            return files
+        # scandir reuses the d_type from readdir, so no stat per entry. Selection
+        # matches os.walk + splitext: symlinked directories are listed but not
+        # entered, every other entry (symlinked files too) is a file candidate
+        extensions = CameraMount._EXT_NO_DOT
+        stack = [str(dcim)]
+        while stack:
+            try:
+                with os.scandir(stack.pop()) as it:
+                    for entry in it:
+                        if entry.is_dir():
+                            if not entry.is_symlink():
+                                stack.append(entry.path)
+                        else:
+                            name = entry.name
+                            dot = name.rfind('.')
+                            # Leading dots are not a suffix, as in splitext ('.jpg' has none)
+                            if dot <= 0 or not name[:dot].lstrip('.'):
+                                continue
+                            # All-lower or all-upper suffixes hit the set directly; any other name pays for lower()
+                            ext = name[dot + 1:]
+                            if ext in extensions or ext.lower() in extensions:
+                                files.append(entry.path)
+            except OSError:
+                continue
         return sorted(files)
 
 
@@ -194,7 +357,7 @@ class CameraFetch:
         print(f"  [FETCH] Found camera at: {camera_path}")
 
         print(f"  [FETCH] Scanning for image/video files in DCIM...")
-        camera_files = CameraMount.find_files(camera_path)
+        camera_files = CameraMount.find_file_paths(camera_path)
         if not camera_files:
             print("  [FETCH] No image/video files found on camera")
             return []
@@ -204,18 +367,40 @@ class CameraFetch:
         print(f"  [FETCH] Creating output directory: {output_dir}")
         os.makedirs(output_dir, exist_ok=True)
 
-        # Filter out files that already exist
+        # Filter out files already present locally; an existing file is never
+        # overwritten. Size alone cannot tell an interrupted copy from another
+        # capture reusing the name after the camera counter restarts, so a
+        # mismatch is only reported. Name, destination and size are resolved
+        # once here and reused below; paths stay plain strings until returned.
         new_files = []
         skipped = 0
+        conflicts = 0
         for src in camera_files:
-            dst = Path(output_dir) / src.name
-            if dst.exists():
+            filename = os.path.basename(src)
+            dst = os.path.join(output_dir, filename)
+            try:
+                src_st = os.stat(src)
+            except OSError as e:
+                print(f"  [FETCH] Error reading {filename}: {e}")
+                continue
+            try:
+                dst_st = os.stat(dst)
+            except OSError:
+                dst_st = None
+            if dst_st is None:
+                new_files.append((src, dst, filename, src_st.st_size))
+            elif (dst_st.st_size == src_st.st_size
+                    and abs(dst_st.st_mtime - src_st.st_mtime) < 1):
                 skipped += 1
             else:
-                new_files.append(src)
+                conflicts += 1
+                print(f"  [FETCH] Conflict: {dst} exists and differs from camera file, not overwriting")
 
         if skipped:
-            print(f"  [FETCH] Skipping {skipped} files already in {output_dir}")
+            print(f"  [FETCH] Skipping {skipped} files already up to date in {output_dir}")
+        if conflicts:
+            print(f"  [FETCH] Skipped {conflicts} files that differ from existing local files; "
+                  f"delete a local copy to fetch it again")
 
         if not new_files:
             print("  [FETCH] No new files to copy")
@@ -223,47 +408,95 @@ class CameraFetch:
 
         print(f"  [FETCH] Starting file transfer ({len(new_files)} new files)...")
 
-        copied = []
-        for i, src in enumerate(new_files, 1):
-            filename = src.name
-            dst = Path(output_dir) / filename
-            try:
-                size = src.stat().st_size
-                size_mb = size / (1024 * 1024)
-                print(f"  [FETCH] [{i}/{len(new_files)}] Copying {filename} ({size_mb:.1f} MB)...")
-                shutil.copy2(src, dst)
-                copied.append(dst)
-            except Exception as e:
-                print(f"  [FETCH] Error copying {filename}: {e}")
+        # gvfs copies are latency-bound and overlap well; local disks stay serial
+        workers = self._config.getint('fetch', 'workers', fallback=4)
+        mode = self._config.get('fetch', 'parallel', fallback='auto').strip().lower()
+        if mode == 'auto':
+            parallel = CameraMount.is_gvfs(camera_path)
+        else:
+            parallel = mode in ('1', 'yes', 'true', 'on')
+
+        # Opt-in move mode: a rename is O(1) when both sides share a filesystem
+        move = (self._config.getboolean('fetch', 'move', fallback=False)
+                and os.stat(camera_path).st_dev == os.stat(output_dir).st_dev)
+
+        if move:
+            print("  [FETCH] Camera and output share a filesystem, moving files")
+            copied = self._copy_serial(new_files, _move)
+        elif parallel and workers > 1:
+            copied = self._copy_parallel(new_files, workers)
+        else:
+            copied = self._copy_serial(new_files)
 
         if copied:
             print(f"  [FETCH] Transfer complete: {len(copied)} files copied")
         else:
             print("  [FETCH] No files copied")
 
+        return [Path(p) for p in copied]
+
+    @staticmethod
+    def _copy_serial(
+        new_files: List[Tuple[str, str, str, int]],
+        transfer: Callable[[str, str], str] = _fast_copy
+    ) -> List[str]:
+        """Copy (or move) files one at a time, reporting each before it starts."""
+        copied = []
+        total = len(new_files)
+        for i, (src, dst, filename, size) in enumerate(new_files, 1):
+            try:
+                size_mb = size / (1024 * 1024)
+                print(_COPY_FMT(i=i, n=total, fn=filename, mb=size_mb))
+                transfer(src, dst)
+                copied.append(dst)
+            except Exception as e:
+                print(f"  [FETCH] Error copying {filename}: {e}")
         return copied
 
-    def load_log_entries(self) -> Dict[datetime.datetime, Tuple[float, str]]:
-        """Load timestamp->frequency mappings from log file."""
+    @staticmethod
+    def _copy_parallel(new_files: List[Tuple[str, str, str, int]], workers: int) -> List[str]:
+        """Copy files on a thread pool, reporting each as it completes."""
+        print(f"  [FETCH] Copying with {workers} parallel workers")
+        done = [False] * len(new_files)
+        total = len(new_files)
+        # Largest first, so big RAW/video files do not end up alone at the tail
+        order = sorted(range(total), key=lambda index: new_files[index][3], reverse=True)
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = {pool.submit(_fast_copy, new_files[index][0], new_files[index][1]): index
+                       for index in order}
+            for i, future in enumerate(as_completed(futures), 1):
+                index = futures[future]
+                _, _, filename, size = new_files[index]
+                try:
+                    future.result()
+                    done[index] = True
+                    print(_COPIED_FMT(i=i, n=total, fn=filename, mb=size / (1024 * 1024)))
+                except Exception as e:
+                    print(f"  [FETCH] Error copying {filename}: {e}")
+        # Keep the camera order for the rename step
+        return [dst for (_, dst, _, _), ok in zip(new_files, done) if ok]
+
+    def load_log_entries(self) -> Dict[datetime.datetime, Tuple[float, str, float]]:
+        """Load timestamp -> (frequency, ts_clean, epoch) mappings from log file."""
         log_file = self._config.get('loop', 'log_file', fallback='stand.log')
         print(f"  [FETCH] Loading log file: {log_file}")
         log_entries = {}
 
         if os.path.exists(log_file):
-            with open(log_file, 'r') as f:
+            match_line = _LOG_LINE_RE.match
+            with open(log_file, 'rb', buffering=1 << 20) as f:
                 for line in f:
-                    line = line.strip()
-                    if not line:
+                    m = match_line(line)
+                    if not m:
                         continue
-                    # Format: "YYYY-MM-DD HH:MM:SS: frequency"
+                    # Build the datetime from the groups; strptime is far slower
+                    parts = m.groups()
                     try:
-                        timestamp_str, freq_str = line.rsplit(': ', 1)
-                        frequency = float(freq_str)
-                        ts = datetime.datetime.strptime(timestamp_str, '%Y-%m-%d %H:%M:%S')
-                        ts_clean = timestamp_str.replace(':', '').replace(' ', '').replace('-', '')
-                        log_entries[ts] = (frequency, ts_clean)
+                        ts = datetime.datetime(*map(int, parts[:6]))
                     except ValueError:
                         continue
+                    ts_clean = b''.join(parts[:6]).decode('ascii')
+                    log_entries[ts] = (float(parts[6]), ts_clean, ts.timestamp())
         else:
             print(f"  [FETCH] Warning: Log file not found")
 
@@ -273,82 +506,102 @@ class CameraFetch:
     def rename_with_log(
         self,
         files: List[Path],
-        log_entries: Dict[datetime.datetime, Tuple[float, str]],
+        log_entries: Dict[datetime.datetime, Tuple[float, str, float]],
         tolerance_secs: int = 5,
         interactive: bool = True
     ) -> Tuple[int, int, int]:
         """Rename files using log entries. Returns (renamed, skipped, deleted)."""
-        tolerance = datetime.timedelta(seconds=tolerance_secs)
         print(f"  [FETCH] Matching files by timestamp (tolerance: {tolerance_secs}s)...\n")
+        # Probe the seconds around each file instead of scanning every entry
+        buckets = _bucket_log_entries(log_entries)
+        window = range(-tolerance_secs - 1, tolerance_secs + 2)
+        # Files outside the logged span cannot match and skip the probe entirely
+        if buckets:
+            first_epoch = min(buckets) - tolerance_secs
+            last_epoch = max(buckets) + 1 + tolerance_secs
+        else:
+            first_epoch, last_epoch = float('inf'), float('-inf')
 
         renamed = 0
         skipped = 0
         deleted = 0
+        out_of_range = 0
 
-        for file_path in files:
-            filename = file_path.name
-
-            try:
-                file_time = file_path.stat().st_mtime
-                file_dt = datetime.datetime.fromtimestamp(file_time)
-            except OSError:
-                print(f"  [RENAME] {filename}: cannot read file time, skipping")
-                skipped += 1
-                continue
+        dir_fds: Dict[Path, int] = {}
+        try:
+            for file_path in files:
+                filename = file_path.name
 
-            # Find matching log entry
-            match = None
-            for log_ts, (freq, ts_clean) in log_entries.items():
-                if abs(file_dt - log_ts) <= tolerance:
-                    match = (freq, ts_clean, log_ts)
-                    break
-
-            if match:
-                freq, ts_clean, log_ts = match
-                ext = file_path.suffix
-                freq_str = f"{freq:07.2f}"
-                new_name = f"{freq_str}-{ts_clean}{ext}"
-                new_path = file_path.parent / new_name
                 try:
-                    os.rename(file_path, new_path)
-                    renamed += 1
-                    print(f"  [RENAME] {filename} -> {new_name} (matched {log_ts})")
-                except OSError as e:
-                    print(f"  [RENAME] {filename}: error - {e}")
-            elif interactive:
-                print(f"\n  [RENAME] {filename}")
-                print(f"  [RENAME] File time: {file_dt}")
-                print(f"  [RENAME] No matching log entry within {tolerance_secs}s tolerance")
-                print(f"  [s]kip  [d]elete  [r]ename manually  [q]uit: ", end='')
-                choice = input().strip().lower()
-
-                if choice == 'd':
+                    file_time = file_path.stat().st_mtime
+                except OSError:
+                    print(f"  [RENAME] {filename}: cannot read file time, skipping")
+                    skipped += 1
+                    continue
+
+                # Find the earliest log entry within tolerance
+                match = None
+                file_second = int(file_time)
+                in_range = first_epoch <= file_time <= last_epoch
+                if not in_range:
+                    out_of_range += 1
+                for delta in window if in_range else ():
+                    for epoch, freq, ts_clean, log_ts in buckets.get(file_second + delta, ()):
+                        if abs(file_time - epoch) <= tolerance_secs:
+                            match = (freq, ts_clean, log_ts)
+                            break
+                    if match:
+                        break
+
+                if match:
+                    freq, ts_clean, log_ts = match
+                    ext = file_path.suffix
+                    freq_str = f"{freq:07.2f}"
+                    new_name = f"{freq_str}-{ts_clean}{ext}"
                     try:
-                        os.remove(file_path)
-                        deleted += 1
-                        print(f"  [RENAME] Deleted {filename}")
+                        _rename_in_dir(file_path, new_name, dir_fds)
+                        renamed += 1
+                        print(_RENAME_FMT(fn=filename, new=new_name, ts=log_ts))
                     except OSError as e:
-                        print(f"  [RENAME] Error deleting: {e}")
-                elif choice == 'r':
-                    new_name = input(f"  [RENAME] Enter new filename: ").strip()
-                    if new_name:
-                        new_path = file_path.parent / new_name
+                        print(f"  [RENAME] {filename}: error - {e}")
+                elif interactive:
+                    print(f"\n  [RENAME] {filename}")
+                    print(f"  [RENAME] File time: {datetime.datetime.fromtimestamp(file_time)}")
+                    print(f"  [RENAME] No matching log entry within {tolerance_secs}s tolerance")
+                    print(f"  [s]kip  [d]elete  [r]ename manually  [q]uit: ", end='')
+                    choice = input().strip().lower()
+
+                    if choice == 'd':
                         try:
-                            os.rename(file_path, new_path)
-                            renamed += 1
-                            print(f"  [RENAME] Renamed to {new_name}")
+                            os.remove(file_path)
+                            deleted += 1
+                            print(f"  [RENAME] Deleted {filename}")
                         except OSError as e:
-                            print(f"  [RENAME] Error renaming: {e}")
+                            print(f"  [RENAME] Error deleting: {e}")
+                    elif choice == 'r':
+                        new_name = input(f"  [RENAME] Enter new filename: ").strip()
+                        if new_name:
+                            try:
+                                _rename_in_dir(file_path, new_name, dir_fds)
+                                renamed += 1
+                                print(f"  [RENAME] Renamed to {new_name}")
+                            except OSError as e:
+                                print(f"  [RENAME] Error renaming: {e}")
+                        else:
+                            skipped += 1
+                            print(f"  [RENAME] Skipped")
+                    elif choice == 'q':
+                        print(f"  [RENAME] Quitting...")
+                        break
                     else:
                         skipped += 1
                         print(f"  [RENAME] Skipped")
-                elif choice == 'q':
-                    print(f"  [RENAME] Quitting...")
-                    break
                 else:
                     skipped += 1
-                    print(f"  [RENAME] Skipped")
-            else:
-                skipped += 1
+        finally:
+            for fd in dir_fds.values():
+                os.close(fd)
 
+        if out_of_range:
+            print(f"  [FETCH] {out_of_range} files outside log range, skipped probe")
         return renamed, skipped, deleted
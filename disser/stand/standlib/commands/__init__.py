@@ -1,16 +1,22 @@
 """Command module initialization and registration."""
 
-from typing import TYPE_CHECKING
+from typing import Callable, Dict, TYPE_CHECKING
 
 if TYPE_CHECKING:
     from ..console import StandConsole
 
 
-def register_commands(console: 'StandConsole') -> None:
-    """Register all command modules with console."""
+def register_commands(console: 'StandConsole') -> Dict[str, Callable[[str], object]]:
+    """Register all command modules with console.
+
+    Returns the dispatch table of every do_* command, class-defined and
+    module-registered, keyed by command name.
+    """
     from . import state, loop, playback, missing
 
     state.register(console)
     loop.register(console)
     playback.register(console)
     missing.register(console)
+
+    return {name[3:]: getattr(console, name) for name in dir(console) if name.startswith('do_')}
@@ -1,19 +1,50 @@
 """Loop control commands: sweep."""
 
+import math
 import sys
 import time
+from types import MethodType
 from typing import TYPE_CHECKING
 
-import numpy as np
-import sounddevice as sd
+from ..audio import open_stream
 
 if TYPE_CHECKING:
+    import numpy as np
+
     from ..console import StandConsole
 
 
+# Sine table for the optional low-CPU sweep path (sweep.lut)
+_LUT_SIZE = 4096
+_SIN_LUT = None
+
+# Samples synthesized and written per stream.write call
+WRITE_BLOCK = 4096
+
+
+def _lut_sin(phases: 'np.ndarray', out: 'np.ndarray') -> None:
+    """Write sin(phases) into out by table lookup with linear interpolation.
+
+    phases must already be wrapped to [0, 2*pi).
+    """
+    import numpy as np
+
+    global _SIN_LUT
+    if _SIN_LUT is None:
+        _SIN_LUT = np.sin(np.linspace(0, 2 * np.pi, _LUT_SIZE, endpoint=False)).astype(np.float32)
+    u = (phases * (_LUT_SIZE / (2 * np.pi))).astype(np.float32)
+    i = u.astype(np.int32)
+    frac = u - i
+    lo = _SIN_LUT[i & (_LUT_SIZE - 1)]
+    hi = _SIN_LUT[(i + 1) & (_LUT_SIZE - 1)]
+    np.subtract(hi, lo, out=out)
+    out *= frac
+    out += lo
+
+
 def register(console: 'StandConsole') -> None:
     """Register loop commands with console."""
-    console.do_sweep = lambda arg: do_sweep(console, arg)
+    console.do_sweep = MethodType(do_sweep, console)
 
 
 def do_sweep(console: 'StandConsole', arg: str) -> None:
@@ -24,38 +55,74 @@ def do_sweep(console: 'StandConsole', arg: str) -> None:
       sweep 200          # Sweep to 200 Hz with default duration
       sweep 300 30       # Sweep to 300 Hz in 30 seconds
     """
+    # Imported on first sweep so console startup does not pay for it
+    import numpy as np
+
     args = arg.split()
     sample_rate = console.config_manager.getint('sound', 'sample_rate', fallback=44100)
     min_freq = 1.0
     max_freq = float(args[0]) if args else console.config_manager.getfloat('sweep', 'max_frequency')
     total_duration = float(args[1]) if len(args) > 1 else console.config_manager.getfloat('sweep', 'duration')
+    if total_duration <= 0:
+        # No [sweep] section in stand.conf reads as 0.0; the chirp rate needs a real duration
+        print("  Usage: sweep [max_freq] [duration]  (duration must be > 0, or set sweep.duration)")
+        return
 
     print(f"  Sweeping {min_freq} Hz -> {max_freq} Hz in {total_duration:.0f} seconds")
     print(f"  Press Ctrl+C to stop")
 
-    # Streaming state
-    phase = [0.0]
-    sample_idx = [0]
     total_samples = int(sample_rate * total_duration)
+    # Linear chirp rate; phase(t) = 2*pi*(f0*t + k*t^2/2) in closed form
+    k = (max_freq - min_freq) / total_duration
+    # The same phase per sample index i: i * (w0 + wk * i), constants hoisted
+    two_pi = 2.0 * math.pi
+    w0 = two_pi * min_freq / sample_rate
+    wk = math.pi * k / (sample_rate * sample_rate)
+    use_lut = console.config_manager.getboolean('sweep', 'lut', fallback=False)
+    # One block buffer reused for every write; stream.write copies it out
+    buf = np.empty((WRITE_BLOCK, 1), dtype=np.float32)
 
-    def callback(outdata, frames, time_info, status):
-        for i in range(frames):
-            inst_freq = min_freq + (max_freq - min_freq) * (sample_idx[0] + i) / total_samples
-            phase[0] += 2 * np.pi * inst_freq / sample_rate
-            outdata[i] = 0.5 * np.sin(phase[0])
-        sample_idx[0] += frames
-        if sample_idx[0] >= total_samples:
-            raise sd.CallbackStop()
+    # Write-based on a stream of its own: synthesis runs here, PortAudio's
+    # thread never needs the GIL, and a running loop's stream is left alone
+    try:
+        stream = open_stream(sample_rate)
+    except Exception as e:
+        print(f"  Sweep error: {e}")
+        return
 
     try:
-        with sd.OutputStream(samplerate=sample_rate, channels=1, callback=callback, blocksize=2048):
-            while sample_idx[0] < total_samples:
-                current_freq = min_freq + (max_freq - min_freq) * sample_idx[0] / total_samples
+        sample_idx = 0
+        next_report = 0.0
+        while sample_idx < total_samples:
+            n = min(WRITE_BLOCK, total_samples - sample_idx)
+            # Index is absolute from sweep start, so blocks join without a phase accumulator
+            i = np.arange(sample_idx, sample_idx + n, dtype=np.float64)
+            # Phase is wrapped in float64; float32 alone loses precision on long sweeps
+            phases = wk * i
+            phases += w0
+            phases *= i
+            np.mod(phases, two_pi, out=phases)
+            out = buf[:n, 0]
+            if use_lut:
+                _lut_sin(phases, out)
+            else:
+                np.sin(phases.astype(np.float32), out=out)
+            out *= np.float32(0.5)
+            stream.write(buf[:n])
+            sample_idx += n
+
+            now = time.monotonic()
+            if now >= next_report:
+                current_freq = min_freq + (max_freq - min_freq) * sample_idx / total_samples
                 sys.stdout.write(f"\r  {current_freq:.1f} Hz  ")
                 sys.stdout.flush()
-                time.sleep(0.5)
+                next_report = now + 0.5
+        stream.stop()
         print(f"\n  Sweep complete")
     except KeyboardInterrupt:
+        stream.abort()
         print("\n  Sweep interrupted")
     except Exception as e:
         print(f"\n  Sweep error: {e}")
+    finally:
+        stream.close()
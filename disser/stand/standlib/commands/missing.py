@@ -1,68 +1,141 @@
 """Missing frequencies detection and rerun commands."""
 
 import datetime
+import math
 import os
-import re
 import threading
 import time
+from dataclasses import dataclass
 from pathlib import Path
-from typing import List, Set, TYPE_CHECKING
-
-import numpy as np
-import sounddevice as sd
+from types import MethodType
+from typing import List, Set, Tuple, TYPE_CHECKING
 
 if TYPE_CHECKING:
+    import numpy as np
+
     from ..console import StandConsole
 
 
+# Last _compute_missing result, reused briefly across `missing` and `rerun`
+_MISSING_TTL = 2.0
+_MISSING_CACHE = {'key': None, 'ts': 0.0, 'result': None}
+
+
+@dataclass
+class _Tone:
+    """Tone being played by the shared rerun stream."""
+
+    omega: float
+    total_samples: int
+    phase: float = 0.0
+    samples_played: int = 0
+
+
 def register(console: 'StandConsole') -> None:
     """Register missing frequency commands with console."""
-    console.do_missing = lambda arg: do_missing(console, arg)
-    console.do_rerun = lambda arg: do_rerun(console, arg)
+    console.do_missing = MethodType(do_missing, console)
+    console.do_rerun = MethodType(do_rerun, console)
 
 
 def get_captured_frequencies(videos_dir: str) -> Set[float]:
     """Extract frequencies from video filenames in directory."""
     frequencies = set()
-    pattern = re.compile(r'^(\d+\.\d+)-')
+    add = frequencies.add
 
     if not os.path.exists(videos_dir):
         return frequencies
 
-    for filename in os.listdir(videos_dir):
-        match = pattern.match(filename)
-        if match:
-            try:
-                freq = float(match.group(1))
-                frequencies.add(freq)
-            except ValueError:
-                pass
+    with os.scandir(videos_dir) as it:
+        for entry in it:
+            filename = entry.name
+            # Renamed captures are regular files starting with a digit; skip
+            # anything else (is_file uses the readdir d_type, no stat)
+            if not filename[:1].isdigit() or not entry.is_file(follow_symlinks=False):
+                continue
+            # Renamed capture: "<frequency>-<timestamp>.<ext>", frequency as digits.digits
+            head, sep, _ = filename.partition('-')
+            whole, dot, frac = head.partition('.')
+            if sep and dot and whole.isdigit() and frac.isdigit():
+                try:
+                    # Rounded like the expected grid so both sides compare exactly
+                    add(round(float(head), 2))
+                except ValueError:
+                    pass
 
     return frequencies
 
 
 def get_expected_frequencies(start: float, end: float, step: float) -> Set[float]:
     """Generate set of expected frequencies."""
-    frequencies = set()
-    freq = start
-    while freq <= end + 0.0001:  # Small epsilon for float comparison
-        frequencies.add(round(freq, 2))
-        freq += step
-    return frequencies
+    return set(_expected_frequency_array(start, end, step).tolist())
+
+
+def _expected_frequency_array(start: float, end: float, step: float) -> 'np.ndarray':
+    """Generate sorted array of expected frequencies, rounded to 2 decimals."""
+    import numpy as np
+
+    if step <= 0 or end < start:
+        return np.empty(0)
+    # Index-based grid: no accumulated drift, same epsilon on the upper bound
+    count = int((end - start + 0.0001) // step) + 1
+    return np.round(start + step * np.arange(count), 2)
+
+
+def _missing_array(expected: 'np.ndarray', captured: Set[float]) -> 'np.ndarray':
+    """Sorted expected frequencies absent from captured."""
+    import numpy as np
+
+    # Nothing captured yet, or everything captured: no difference to compute
+    if not captured:
+        return expected
+    if len(captured) >= expected.size and captured.issuperset(expected.tolist()):
+        return expected[:0]
+    # Pick the cheaper membership test by which side is larger; expected is
+    # already sorted, so masking keeps the result sorted
+    if len(captured) * 4 < expected.size:
+        captured_arr = np.fromiter(captured, dtype=float, count=len(captured))
+        return expected[~np.isin(expected, captured_arr)]
+    absent = np.fromiter((f not in captured for f in expected.tolist()),
+                         dtype=bool, count=expected.size)
+    return expected[absent]
+
+
+def _missing_settings(console: 'StandConsole') -> Tuple[str, float, float, float]:
+    """Read (videos_dir, start_freq, max_freq, step) from config."""
+    return (
+        console.config_manager.get('fetch', 'output_dir', fallback='./videos'),
+        console.config_manager.getfloat('loop', 'start_frequency', fallback=0.0),
+        console.config_manager.getfloat('loop', 'max_frequency', fallback=400.0),
+        console.config_manager.getfloat('loop', 'step', fallback=0.5),
+    )
+
+
+def _compute_missing(videos_dir: str, start_freq: float, max_freq: float,
+                     step: float) -> Tuple[int, int, 'np.ndarray']:
+    """Return (captured count, expected count, sorted missing array).
+
+    The result is reused for a couple of seconds while the settings and the
+    directory mtime are unchanged, so `missing` followed by `rerun` scans once.
+    """
+    try:
+        dir_mtime = os.stat(videos_dir).st_mtime_ns
+    except OSError:
+        dir_mtime = None
+    key = (videos_dir, start_freq, max_freq, step, dir_mtime)
+    now = time.monotonic()
+    if _MISSING_CACHE['key'] == key and now - _MISSING_CACHE['ts'] < _MISSING_TTL:
+        return _MISSING_CACHE['result']
+
+    captured = get_captured_frequencies(videos_dir)
+    expected = _expected_frequency_array(start_freq, max_freq, step)
+    result = (len(captured), expected.size, _missing_array(expected, captured))
+    _MISSING_CACHE.update(key=key, ts=now, result=result)
+    return result
 
 
 def find_missing_frequencies(console: 'StandConsole') -> List[float]:
     """Find frequencies that are expected but not captured."""
-    videos_dir = console.config_manager.get('fetch', 'output_dir', fallback='./videos')
-    start_freq = console.config_manager.getfloat('loop', 'start_frequency', fallback=0.0)
-    max_freq = console.config_manager.getfloat('loop', 'max_frequency', fallback=400.0)
-    step = console.config_manager.getfloat('loop', 'step', fallback=0.5)
-
-    captured = get_captured_frequencies(videos_dir)
-    expected = get_expected_frequencies(start_freq, max_freq, step)
-
-    missing = expected - captured
-    return sorted(missing)
+    return _compute_missing(*_missing_settings(console))[2].tolist()
 
 
 def do_missing(console: 'StandConsole', arg: str) -> None:
@@ -73,48 +146,34 @@ def do_missing(console: 'StandConsole', arg: str) -> None:
 
     Usage: missing
     """
-    videos_dir = console.config_manager.get('fetch', 'output_dir', fallback='./videos')
-    start_freq = console.config_manager.getfloat('loop', 'start_frequency', fallback=0.0)
-    max_freq = console.config_manager.getfloat('loop', 'max_frequency', fallback=400.0)
-    step = console.config_manager.getfloat('loop', 'step', fallback=0.5)
+    videos_dir, start_freq, max_freq, step = _missing_settings(console)
 
     print(f"  Checking {videos_dir} for missing frequencies...")
     print(f"  Expected range: {start_freq} Hz to {max_freq} Hz (step {step})")
 
-    captured = get_captured_frequencies(videos_dir)
-    expected = get_expected_frequencies(start_freq, max_freq, step)
-    missing = sorted(expected - captured)
+    # Kept as an array; only the short listing below converts to Python floats
+    n_captured, n_expected, missing = _compute_missing(videos_dir, start_freq, max_freq, step)
 
-    print(f"  Captured: {len(captured)} frequencies")
-    print(f"  Expected: {len(expected)} frequencies")
+    print(f"  Captured: {n_captured} frequencies")
+    print(f"  Expected: {n_expected} frequencies")
     print(f"  Missing:  {len(missing)} frequencies")
 
-    if missing:
+    if missing.size:
         print(f"\n  Missing frequencies:")
         # Group consecutive ranges
-        if len(missing) <= 20:
-            for freq in missing:
+        if missing.size <= 20:
+            for freq in missing.tolist():
                 print(f"    {freq:.2f} Hz")
         else:
-            # Show ranges for large lists
-            ranges = []
-            start = missing[0]
-            prev = missing[0]
-            for freq in missing[1:]:
-                if abs(freq - prev - step) < 0.01:
-                    prev = freq
-                else:
-                    if start == prev:
-                        ranges.append(f"{start:.2f}")
-                    else:
-                        ranges.append(f"{start:.2f}-{prev:.2f}")
-                    start = freq
-                    prev = freq
-            # Add last range
-            if start == prev:
-                ranges.append(f"{start:.2f}")
-            else:
-                ranges.append(f"{start:.2f}-{prev:.2f}")
+            # Show ranges for large lists; a range breaks where the gap is not one step
+            import numpy as np
+
+            arr = missing
+            breaks = np.nonzero(np.abs(np.diff(arr) - step) >= 0.01)[0]
+            starts = arr[np.concatenate(([0], breaks + 1))].tolist()
+            ends = arr[np.concatenate((breaks, [len(arr) - 1]))].tolist()
+            ranges = [f"{start:.2f}" if start == end else f"{start:.2f}-{end:.2f}"
+                      for start, end in zip(starts, ends)]
 
             print(f"    {', '.join(ranges[:10])} Hz" + (" ..." if len(ranges) > 10 else ""))
 
@@ -146,21 +205,25 @@ def do_rerun(console: 'StandConsole', arg: str) -> None:
 
 def _run_missing_loop(console: 'StandConsole', frequencies: List[float]) -> None:
     """Run loop for specific list of frequencies."""
-    from ..workers import OutputPrinter, format_time
+    import numpy as np
+    import sounddevice as sd
+
+    from ..workers import LoopSettings, OutputPrinter, format_clock, format_time
 
-    sample_rate = console.config_manager.getint('sound', 'sample_rate', fallback=44100)
-    duration = console.config_manager.getfloat('loop', 'duration', fallback=1.0)
-    loop_sleep = console.config_manager.getfloat('loop', 'loop_sleep', fallback=10.0)
-    ir_delay = console.config_manager.getfloat('loop', 'ir_delay', fallback=10.0)
-    log_file = console.config_manager.get('loop', 'log_file', fallback='stand.log')
+    cfg = LoopSettings.from_config(console.config_manager)
 
-    printer = OutputPrinter(console.prompt, console.output_lock)
+    printer = OutputPrinter(console.prompt)
     stop_event = threading.Event()
     ir_trigger = threading.Event()
 
     # Store stop event for external control
     console._rerun_stop_event = stop_event
 
+    # Shared with the IR thread (a closure cell, rebound only here) instead of
+    # round-tripping through the config
+    current_freq = 0.0
+    ir_command = console.config_manager.ir_command
+
     def ir_worker():
         """IR worker thread for rerun."""
         while not stop_event.is_set():
@@ -169,21 +232,19 @@ def _run_missing_loop(console: 'StandConsole', frequencies: List[float]) -> None
                 break
             ir_trigger.clear()
 
-            # Wait before sending IR
-            time.sleep(ir_delay)
-            if stop_event.is_set():
+            # Wait before sending IR, returning early on stop
+            if stop_event.wait(cfg.ir_delay):
                 break
 
             # Send IR command
             if console.serial_handler.is_connected:
                 try:
-                    cmd = console.config_manager.ir_command
-                    success = console.serial_handler.write(cmd)
+                    success = console.serial_handler.write(ir_command)
                     if success:
-                        freq = console.config_manager.getfloat('loop', 'current_frequency', fallback=0)
+                        freq = current_freq
                         try:
-                            with open(log_file, 'a') as f:
-                                f.write(f"{datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')}: {freq:.1f}\n")
+                            if log_fh is not None:
+                                log_fh.write(f"{datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')}: {freq:.1f}\n")
                         except Exception:
                             pass
                         printer.print_line(f"  -> IR sent @ {freq:.2f} Hz")
@@ -192,63 +253,84 @@ def _run_missing_loop(console: 'StandConsole', frequencies: List[float]) -> None
             else:
                 printer.print_line(f"  !! IR skipped (not connected)")
 
+    # One line-buffered log handle for the run instead of an open per IR fire
+    try:
+        log_fh = open(cfg.log_file, 'a', buffering=1)
+    except OSError:
+        log_fh = None
+
     # Start IR thread
     ir_thread = threading.Thread(target=ir_worker, daemon=True)
     ir_thread.start()
 
     total = len(frequencies)
-    time_per_iter = duration + loop_sleep
+    time_per_iter = cfg.duration + cfg.loop_sleep
+
+    # One callback stream for the whole rerun; each frequency swaps in a new tone
+    total_samples = int(cfg.sample_rate * cfg.duration)
+    tone = _Tone(0.0, 0)
+    done_event = threading.Event()
+    two_pi = 2.0 * math.pi
+    omega_per_hz = two_pi / cfg.sample_rate
+
+    def audio_callback(outdata, frames, time_info, status):
+        if stop_event.is_set():
+            outdata.fill(0)
+            done_event.set()
+            raise sd.CallbackStop()
+        # Silence between tones; one vectorized block per call while playing
+        state = tone
+        n = min(frames, state.total_samples - state.samples_played)
+        out = outdata[:n, 0]
+        np.sin((state.phase + state.omega * np.arange(1, n + 1)).astype(np.float32), out=out)
+        out *= np.float32(0.5)
+        outdata[n:] = 0
+        state.phase = math.fmod(state.phase + state.omega * n, two_pi)
+        state.samples_played += n
+        if n and state.samples_played >= state.total_samples:
+            done_event.set()
 
     try:
-        for i, frequency in enumerate(frequencies):
-            if stop_event.is_set():
-                break
-
-            # Update current frequency in config
-            console.config_manager.set('loop', 'current_frequency', str(frequency))
+        stream = sd.OutputStream(samplerate=cfg.sample_rate, channels=1, dtype='float32',
+                                 callback=audio_callback, blocksize=2048)
+        stream.start()
+        finished = False
+        try:
+            for i, frequency in enumerate(frequencies):
+                if stop_event.is_set():
+                    break
 
-            # Calculate progress
-            remaining = total - i
-            time_left = remaining * time_per_iter
-            eta = datetime.datetime.now() + datetime.timedelta(seconds=time_left)
+                current_freq = frequency
 
-            progress = f"Rerun: {i+1}/{total} ({format_time(time_left)} remaining, ends at {eta.strftime('%H:%M')})"
-            printer.print_line(f"  ♪ {frequency:.2f} Hz | {progress}")
+                # Calculate progress
+                remaining = total - i
+                time_left = remaining * time_per_iter
+                progress = f"Rerun: {i+1}/{total} ({format_time(time_left)} remaining, ends at {format_clock(time_left)})"
+                printer.print_line(f"  ♪ {frequency:.2f} Hz | {progress}")
 
-            # Signal IR thread
-            ir_trigger.set()
+                # Signal IR thread
+                ir_trigger.set()
 
-            # Streaming audio playback
-            phase = [0.0]
-            total_samples = int(sample_rate * duration)
-            samples_played = [0]
+                # Swap the tone in atomically; the callback signals when it has played
+                done_event.clear()
+                tone = _Tone(omega_per_hz * frequency, total_samples)
+                done_event.wait(cfg.duration + 2)
 
-            def audio_callback(outdata, frames, time_info, status):
                 if stop_event.is_set():
-                    raise sd.CallbackStop()
-                for j in range(frames):
-                    if samples_played[0] >= total_samples:
-                        outdata[j:] = 0
-                        raise sd.CallbackStop()
-                    phase[0] += 2 * np.pi * frequency / sample_rate
-                    outdata[j] = 0.5 * np.sin(phase[0])
-                    samples_played[0] += 1
-
-            with sd.OutputStream(samplerate=sample_rate, channels=1,
-                                 callback=audio_callback, blocksize=2048):
-                while samples_played[0] < total_samples and not stop_event.is_set():
-                    time.sleep(0.1)
-
-            if stop_event.is_set():
-                break
+                    break
 
-            # Sleep between iterations
-            printer.print_line(f"  zzz sleeping {loop_sleep:.0f}s...")
-            sleep_iterations = int(loop_sleep * 10)
-            for _ in range(sleep_iterations):
-                if stop_event.is_set():
+                # Sleep between iterations
+                printer.print_line(f"  zzz sleeping {cfg.loop_sleep:.0f}s...")
+                if stop_event.wait(cfg.loop_sleep):
                     break
-                time.sleep(0.1)
+            finished = True
+        finally:
+            # Stop or Ctrl+C discards queued audio at once; drain only on completion
+            if finished and not stop_event.is_set():
+                stream.stop()
+            else:
+                stream.abort()
+            stream.close()
 
         if not stop_event.is_set():
             print(f"\n  Rerun complete! Processed {total} missing frequencies")
@@ -262,4 +344,9 @@ def _run_missing_loop(console: 'StandConsole', frequencies: List[float]) -> None
         stop_event.set()
         ir_trigger.set()  # Wake up IR thread
         ir_thread.join(timeout=2)
+        if log_fh is not None:
+            log_fh.close()
+        # Record the last frequency played once, as the per-iteration set did
+        if current_freq:
+            console.config_manager.set('loop', 'current_frequency', str(current_freq))
         console._rerun_stop_event = None
@@ -1,19 +1,34 @@
 """Playback commands: sound, ir, test."""
 
-from typing import TYPE_CHECKING
+import re
+from types import MethodType
+from typing import Optional, Tuple, TYPE_CHECKING
 
-import numpy as np
-import sounddevice as sd
+from ..audio import make_tone, open_stream
 
 if TYPE_CHECKING:
     from ..console import StandConsole
 
 
+_NUMBER_RE = re.compile(r'[-+]?(?:\d+\.?\d*|\.\d+)')
+
+
 def register(console: 'StandConsole') -> None:
     """Register playback commands with console."""
-    console.do_sound = lambda arg: do_sound(console, arg)
-    console.do_ir = lambda arg: do_ir(console, arg)
-    console.do_test = lambda arg: do_test(console, arg)
+    console.do_sound = MethodType(do_sound, console)
+    console.do_ir = MethodType(do_ir, console)
+    console.do_test = MethodType(do_test, console)
+
+
+def _parse_sound_args(console: 'StandConsole', arg: str) -> Optional[Tuple[float, float]]:
+    """Parse `[frequency] [duration]`, filling gaps from config. None if invalid."""
+    args = arg.split()[:2]
+    if not all(_NUMBER_RE.fullmatch(a) for a in args):
+        return None
+    config = console.config_manager
+    frequency = float(args[0]) if args else config.getfloat('sound', 'frequency')
+    duration = float(args[1]) if len(args) > 1 else config.getfloat('sound', 'duration')
+    return frequency, duration
 
 
 def do_sound(console: 'StandConsole', arg: str) -> None:
@@ -24,18 +39,25 @@ def do_sound(console: 'StandConsole', arg: str) -> None:
       sound 440          # 440 Hz with default duration
       sound 880 0.5      # 880 Hz for 0.5 seconds
     """
-    args = arg.split()
-    frequency = float(args[0]) if args else console.config_manager.getfloat('sound', 'frequency')
-    duration = float(args[1]) if len(args) > 1 else console.config_manager.getfloat('sound', 'duration')
+    parsed = _parse_sound_args(console, arg)
+    if parsed is None:
+        print("  Usage: sound [frequency] [duration]")
+        return
+    frequency, duration = parsed
     sample_rate = console.config_manager.getint('sound', 'sample_rate')
 
     try:
         print(f"  [SOUND] Generating sine wave: {frequency} Hz, {duration}s, {sample_rate} sample rate")
-        t = np.linspace(0, duration, int(sample_rate * duration), False)
-        wave = 0.5 * np.sin(2 * np.pi * frequency * t)
+        wave = make_tone(frequency, duration, sample_rate)
         print(f"  [SOUND] Playing audio...")
-        sd.play(wave, sample_rate)
-        sd.wait()
+        # Blocking writes keep Python off the PortAudio callback thread; the
+        # stream is this command's own, so a running loop is never interleaved
+        stream = open_stream(sample_rate)
+        try:
+            stream.write(wave.reshape(-1, 1))
+            stream.stop()  # Returns once the queued tail has played
+        finally:
+            stream.close()
         print(f"  [SOUND] Playback complete")
     except Exception as e:
         print(f"  [SOUND] Error: {e}")
@@ -1,5 +1,6 @@
 """State machine control commands."""
 
+from types import MethodType
 from typing import TYPE_CHECKING
 
 if TYPE_CHECKING:
@@ -8,13 +9,13 @@ if TYPE_CHECKING:
 
 def register(console: 'StandConsole') -> None:
     """Register state commands with console."""
-    console.do_state = lambda arg: do_state(console, arg)
-    console.do_start = lambda arg: do_start(console, arg)
-    console.do_pause = lambda arg: do_pause(console, arg)
-    console.do_resume = lambda arg: do_resume(console, arg)
-    console.do_stop = lambda arg: do_stop(console, arg)
-    console.do_reset = lambda arg: do_reset(console, arg)
-    console.do_transitions = lambda arg: do_transitions(console, arg)
+    console.do_state = MethodType(do_state, console)
+    console.do_start = MethodType(do_start, console)
+    console.do_pause = MethodType(do_pause, console)
+    console.do_resume = MethodType(do_resume, console)
+    console.do_stop = MethodType(do_stop, console)
+    console.do_reset = MethodType(do_reset, console)
+    console.do_transitions = MethodType(do_transitions, console)
 
 
 def do_state(console: 'StandConsole', arg: str) -> None:
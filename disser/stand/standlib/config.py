@@ -2,15 +2,19 @@
 
 import configparser
 import os
+import bisect
+import re
 import threading
-from typing import Any, List, Tuple
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 
 DEFAULT_CONFIG = {
     'serial': {
         'port': '/dev/ttyUSB0',
         'baudrate': '115200',
-        'baudrates': '9600,19200,38400,57600,115200'
+        'baudrates': '9600,19200,38400,57600,115200',
+        'timeout': '0.1',
+        'expected_reply_bytes': '64'
     },
     'commands': {
         'ir_engage': '!r\\n'
@@ -28,29 +32,112 @@ DEFAULT_CONFIG = {
         'ir_delay': '10.0',
         'loop_sleep': '5.0',
         'max_loops_per_run': '250',
-        'log_file': 'stand.log'
+        'log_file': 'stand.log',
+        'save_every': '10'
     },
     'fetch': {
         'output_dir': './videos',
-        'tolerance': '10'
+        'tolerance': '10',
+        'workers': '4',
+        'parallel': 'auto',
+        'move': 'false'
     }
 }
 
 
+# One line of a simple INI file: section header, `key = value`, comment or blank
+_INI_LINE_RE = re.compile(r"""
+    (?:
+        \[(?P<section>[^\]\n]+)\]
+      | (?P<key>[^=:\s#;\[][^=:\n]*?)[ \t]*=[ \t]*(?P<value>[^\n]*?)
+      | [ \t]*[#;][^\n]*
+    )?[ \t\r]*(?:\n|\Z)
+""", re.VERBOSE)
+
+
+def _parse_ini(text: str) -> Optional[Dict[str, Dict[str, str]]]:
+    """Parse INI text made of sections and single-line `key = value` pairs.
+
+    Returns None for anything else (continuation lines, ':' delimiters,
+    options before the first section, duplicate sections or options),
+    leaving it to configparser, which also raises the duplicate errors.
+    A trailing '\r' from CRLF line ends is stripped like other whitespace.
+    """
+    data: Dict[str, Dict[str, str]] = {}
+    section = None
+    pos = 0
+    end = len(text)
+    match = _INI_LINE_RE.match
+    while pos < end:
+        m = match(text, pos)
+        if m is None or m.end() == pos:
+            return None
+        pos = m.end()
+        if m.group('section') is not None:
+            name = m.group('section')
+            if name in data:
+                return None
+            section = data[name] = {}
+            # Option names compare case-insensitively, as configparser's optionxform
+            seen = set()
+        elif m.group('key') is not None:
+            if section is None:
+                return None
+            key = m.group('key')
+            folded = key.lower()
+            if folded in seen:
+                return None
+            seen.add(folded)
+            section[key] = m.group('value')
+    return data
+
+
+# Parsed config files by absolute path: (st_mtime_ns, sections)
+_CONFIG_CACHE: Dict[str, Tuple[int, Dict[str, Dict[str, str]]]] = {}
+
+
+def _read_cached(path: str) -> Optional[Dict[str, Dict[str, str]]]:
+    """Parse config file, reusing the cached result while its mtime is unchanged."""
+    key = os.path.abspath(path)
+    mtime_ns = os.stat(path).st_mtime_ns
+    cached = _CONFIG_CACHE.get(key)
+    if cached is not None and cached[0] == mtime_ns:
+        return cached[1]
+    with open(path) as f:
+        data = _parse_ini(f.read())
+    if data is not None:
+        _CONFIG_CACHE[key] = (mtime_ns, data)
+    return data
+
+
 class ConfigManager:
     """Thread-safe configuration management."""
 
     def __init__(self, config_file: str = 'stand.conf'):
-        self._lock = threading.RLock()
-        self._config = configparser.ConfigParser()
+        # Plain Lock: methods never re-enter it; _locked helpers assume it is held
+        self._lock = threading.Lock()
+        self._config = configparser.ConfigParser(interpolation=None)
         self.config_file = config_file
         self.loaded = False
+        # Sorted "section.key" strings for tab completion, built on demand
+        self._completion_keys: Optional[List[str]] = None
+        # Converted option values by (section, key, kind), dropped on change
+        self._cache: Dict[Tuple[str, str, str], Any] = {}
+        # Decoded commands.ir_engage, sent on every IR fire
+        self._ir_command: Optional[bytes] = None
 
     def load(self) -> bool:
         """Load config from file, creating default if missing."""
         with self._lock:
+            self._completion_keys = None
+            self._cache.clear()
+            self._ir_command = None
             if os.path.exists(self.config_file):
-                self._config.read(self.config_file)
+                parsed = _read_cached(self.config_file)
+                if parsed is None:
+                    self._config.read(self.config_file)
+                else:
+                    self._config.read_dict(parsed)
                 self.loaded = True
                 print(f"  Loaded config from {self.config_file}")
                 return True
@@ -60,32 +147,55 @@ class ConfigManager:
                 return True
 
     def _create_default(self) -> None:
-        """Create default configuration."""
+        """Create default configuration. Caller holds the lock."""
         for section, values in DEFAULT_CONFIG.items():
             self._config[section] = values
-        self.save()
+        self._save_locked()
         print(f"  Created default config: {self.config_file}")
 
     def save(self) -> None:
         """Thread-safe save to file."""
         with self._lock:
-            with open(self.config_file, 'w') as f:
-                self._config.write(f)
+            self._save_locked()
+
+    def _save_locked(self) -> None:
+        """Write config to file. Caller holds the lock."""
+        with open(self.config_file, 'w') as f:
+            self._config.write(f)
+
+    def _lookup(self, section: str, key: str, kind: str,
+                convert: Callable[[str, str], Any], fallback: Any) -> Any:
+        """Cached converted lookup; missing options return fallback uncached."""
+        cache_key = (section, self._config.optionxform(key), kind)
+        # Hits skip the lock: dict reads are atomic and set()/load() only drop entries
+        try:
+            return self._cache[cache_key]
+        except KeyError:
+            pass
+        with self._lock:
+            if cache_key in self._cache:
+                return self._cache[cache_key]
+            if not self._config.has_option(section, key):
+                return fallback
+            value = convert(section, key)
+            self._cache[cache_key] = value
+            return value
 
     def get(self, section: str, key: str, fallback: Any = None) -> str:
         """Thread-safe get with fallback."""
-        with self._lock:
-            return self._config.get(section, key, fallback=fallback)
+        return self._lookup(section, key, 'str', self._config.get, fallback)
 
     def getint(self, section: str, key: str, fallback: int = 0) -> int:
         """Thread-safe get integer."""
-        with self._lock:
-            return self._config.getint(section, key, fallback=fallback)
+        return self._lookup(section, key, 'int', self._config.getint, fallback)
 
     def getfloat(self, section: str, key: str, fallback: float = 0.0) -> float:
         """Thread-safe get float."""
-        with self._lock:
-            return self._config.getfloat(section, key, fallback=fallback)
+        return self._lookup(section, key, 'float', self._config.getfloat, fallback)
+
+    def getboolean(self, section: str, key: str, fallback: bool = False) -> bool:
+        """Thread-safe get boolean."""
+        return self._lookup(section, key, 'bool', self._config.getboolean, fallback)
 
     def set(self, section: str, key: str, value: str) -> None:
         """Thread-safe set value."""
@@ -93,6 +203,12 @@ class ConfigManager:
             if not self._config.has_section(section):
                 self._config.add_section(section)
             self._config.set(section, key, value)
+            option = self._config.optionxform(key)
+            for kind in ('str', 'int', 'float', 'bool'):
+                self._cache.pop((section, option, kind), None)
+            if section == 'commands' and option == 'ir_engage':
+                self._ir_command = None
+            self._add_completion_key(f"{section}.{option}")
 
     def sections(self) -> List[str]:
         """Get all section names."""
@@ -125,6 +241,26 @@ class ConfigManager:
             if not self._config.has_section(section):
                 self._config.add_section(section)
 
+    def completion_keys(self) -> List[str]:
+        """Get the sorted "section.key" list, cached until keys change."""
+        with self._lock:
+            if self._completion_keys is None:
+                self._completion_keys = sorted(
+                    f"{section}.{key}"
+                    for section in self._config.sections()
+                    for key in self._config.options(section)
+                )
+            return self._completion_keys
+
+    def _add_completion_key(self, key_path: str) -> None:
+        """Insert a new section.key into the completion cache, if built."""
+        keys = self._completion_keys
+        if keys is None:
+            return
+        i = bisect.bisect_left(keys, key_path)
+        if i == len(keys) or keys[i] != key_path:
+            keys.insert(i, key_path)
+
     # Convenience properties
     @property
     def serial_port(self) -> str:
@@ -136,8 +272,25 @@ class ConfigManager:
         """Get baudrate from config."""
         return self.getint('serial', 'baudrate', fallback=115200)
 
+    @property
+    def serial_timeout(self) -> float:
+        """Get serial read timeout in seconds from config."""
+        return self.getfloat('serial', 'timeout', fallback=0.1)
+
+    @property
+    def expected_reply_bytes(self) -> int:
+        """Get maximum serial reply length read as one line."""
+        return self.getint('serial', 'expected_reply_bytes', fallback=64)
+
     @property
     def ir_command(self) -> bytes:
-        """Get IR command as bytes."""
-        cmd_str = self.get('commands', 'ir_engage', fallback='!r\\n')
-        return cmd_str.encode().decode('unicode_escape').encode()
+        """Get IR command as bytes, decoded once until commands.ir_engage changes."""
+        # Fast path without the lock; set() and load() only ever reset it to None
+        cmd = self._ir_command
+        if cmd is not None:
+            return cmd
+        with self._lock:
+            if self._ir_command is None:
+                cmd_str = self._config.get('commands', 'ir_engage', fallback='!r\\n')
+                self._ir_command = cmd_str.encode().decode('unicode_escape').encode()
+            return self._ir_command
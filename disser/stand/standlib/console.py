@@ -1,7 +1,13 @@
 """Main console application."""
 
+import bisect
 import cmd
-import threading
+import re
+import sys
+import time
+from typing import List
+
+from serial.tools import list_ports
 
 from .config import ConfigManager
 from .state_machine import CommandStateMachine
@@ -11,6 +17,129 @@ from .camera import CameraSync, CameraFetch
 from .commands import register_commands
 
 
+_HELP_TEXT = """
+Stand - Arduino IR Lamp Controller
+===================================
+(Auto-connects to Arduino on startup using config settings)
+
+CONFIGURATION:
+  config        Display current configuration from stand.conf.
+
+  set <section>.<key> <value>
+                Set a configuration value and save to stand.conf.
+                Examples: set serial.port /dev/ttyACM0
+                          set serial.baudrate 115200
+                          set commands.ir_engage !r\\n
+
+SERIAL CONNECTION:
+  disconnect    Close the serial connection to Arduino.
+
+  test          Send IR command to Arduino and play confirmation sound.
+
+DEVICE CONTROL:
+  ir            Engage the IR lamp by sending command to Arduino.
+
+  sound [freq] [duration]
+                Generate and play a sine wave sound.
+                Examples: sound              # Use defaults from config
+                          sound 440          # 440 Hz with default duration
+                          sound 880 0.5      # 880 Hz for 0.5 seconds
+
+STATE MACHINE (controls frequency loop):
+  state         Show current state of the system.
+                States: idle, ready, running, paused, stopped
+
+  transitions   List available state transitions from current state.
+
+  start         Start frequency loop (ready -> running)
+                Plays 1 Hz -> 400 Hz, incrementing by 0.1 Hz each second.
+                Frequency saved to config every loop.save_every cycles (default 10).
+
+  pause         Pause loop without saving (running -> paused)
+
+  resume        Resume loop from current frequency (paused/stopped -> running)
+
+  stop          Stop loop without saving (running/paused -> stopped)
+
+  reset         Reset state to idle (from any state)
+
+CAMERA:
+  sync          Sync camera time with host computer using gphoto2.
+
+  fetch [dir]   Fetch photos from mounted camera filesystem and rename.
+                Copies from DCIM folder to ./photos/ by default, then
+                prompts to rename as <frequency>-<timestamp>.<extension>
+
+  missing       Show frequencies missing from fetched videos.
+                Compares files in output directory against expected range.
+
+  rerun         Loop through only the missing frequencies.
+                Plays sound and triggers IR for each missing frequency.
+
+OTHER:
+  help [cmd]    Show this help or help for specific command.
+  quit, exit    Exit the application.
+
+TYPICAL WORKFLOW:
+  1. test                  # Verify connection (plays sound)
+  2. sync                  # Sync camera time (optional)
+  3. ir                    # Engage IR lamp
+  4. start                 # Start frequency sweep loop
+  5. pause / resume        # Control loop as needed
+  6. stop                  # Stop without saving progress
+
+CONFIG FILE (stand.conf):
+  [serial]
+  port = /dev/ttyUSB0      # Default serial port
+  baudrate = 9600          # Serial baud rate
+  timeout = 0.1            # Serial read timeout in seconds
+
+  [commands]
+  ir_engage = !r\\n         # Command to engage IR lamp
+
+  [sound]
+  frequency = 440          # Default frequency in Hz
+  duration = 1.0           # Default duration in seconds
+  sample_rate = 44100      # Audio sample rate
+
+  [loop]
+  current_frequency = 1.0  # Current/resume frequency
+  max_frequency = 400.0    # Maximum frequency
+  step = 0.1               # Frequency increment per cycle
+  duration = 1.0           # Duration of each tone
+
+"""
+
+
+# Command name and argument of a stripped input line; \w matches cmd.Cmd.identchars
+_COMMAND_RE = re.compile(r'(\w*)\s*(.*)', re.ASCII | re.DOTALL)
+
+
+# Suggested values for `set` completion, by key name
+_VALUE_SUGGESTIONS = {
+    'frequency': ('1.0', '10.0', '50.0', '100.0', '200.0', '400.0'),
+    'current_frequency': ('1.0', '10.0', '50.0', '100.0', '200.0', '400.0'),
+    'max_frequency': ('100.0', '200.0', '400.0', '480.0', '1000.0'),
+    'step': ('0.1', '0.2', '0.5', '1.0', '2.0', '5.0'),
+    'duration': ('1.0', '5.0', '10.0', '20.0', '30.0', '60.0'),
+    'ir_delay': ('5.0', '10.0', '15.0', '20.0', '30.0'),
+    'loop_sleep': ('5.0', '10.0', '15.0', '20.0', '30.0'),
+    'max_loops_per_run': ('50', '100', '200', '500', '1000'),
+    'sample_rate': ('22050', '44100', '48000', '96000'),
+    'log_file': ('stand.log', 'experiment.log'),
+}
+
+
+def _prefix_matches(options, text: str) -> List[str]:
+    """Return entries of sorted options starting with text."""
+    matches = []
+    for i in range(bisect.bisect_left(options, text), len(options)):
+        if not options[i].startswith(text):
+            break
+        matches.append(options[i])
+    return matches
+
+
 class StandConsole(cmd.Cmd):
     """Interactive console for Stand application."""
 
@@ -24,13 +153,17 @@ class StandConsole(cmd.Cmd):
         self.config_manager = ConfigManager(config_file)
         self.state_machine = CommandStateMachine()
         self.serial_handler = SerialHandler(self.config_manager)
-        self.output_lock = threading.Lock()
+        self._ports_cache = (0.0, [])
+        # Value suggestions that depend on runtime state, by key name
+        self._value_sources = {
+            'port': self._port_suggestions,
+            'baudrate': self._baudrate_suggestions,
+        }
 
         self.worker_manager = WorkerManager(
             config=self.config_manager,
             serial_handler=self.serial_handler,
             state_machine=self.state_machine,
-            output_lock=self.output_lock,
             prompt=self.prompt,
         )
 
@@ -38,7 +171,8 @@ class StandConsole(cmd.Cmd):
         self.camera_fetch = CameraFetch(self.config_manager)
 
         # Register command modules
-        register_commands(self)
+        self._cmd_table = register_commands(self)
+        self._cmd_names = tuple(sorted(self._cmd_table))
 
         # Auto-initialize
         self._auto_init()
@@ -86,11 +220,13 @@ class StandConsole(cmd.Cmd):
     # Config commands
     def do_config(self, arg: str) -> None:
         """Show current configuration."""
-        print("Current configuration:")
+        # Built up front and written once rather than printed line by line
+        lines = ["Current configuration:"]
         for section in self.config_manager.sections():
-            print(f"  [{section}]")
-            for key, value in self.config_manager.items(section):
-                print(f"    {key} = {value}")
+            lines.append(f"  [{section}]")
+            lines.extend(f"    {key} = {value}" for key, value in self.config_manager.items(section))
+        lines.append('')
+        sys.stdout.write('\n'.join(lines))
 
     def do_set(self, arg: str) -> None:
         """Set configuration value. Usage: set <section>.<key> <value>
@@ -125,16 +261,19 @@ class StandConsole(cmd.Cmd):
         self.config_manager.save()
         print(f"  Set {section}.{key} = {value}")
 
+        # The read timeout applies to the open port at once; port and baud need a reconnect
+        if section == 'serial' and key.lower() == 'timeout':
+            try:
+                self.serial_handler.set_timeout(float(value))
+            except ValueError:
+                print(f"  Warning: {value} is not a number, port timeout unchanged")
+
     def complete_set(self, text, line, begidx, endidx):
         """Autocomplete for set command."""
         args = line.split()
         if len(args) == 1 or (len(args) == 2 and not line.endswith(' ')):
             # Complete section.key
-            options = []
-            for section in self.config_manager.sections():
-                for key in self.config_manager.options(section):
-                    options.append(f"{section}.{key}")
-            return [opt for opt in options if opt.startswith(text)]
+            return _prefix_matches(self.config_manager.completion_keys(), text)
         elif len(args) >= 2:
             # Complete value based on key
             key_path = args[1]
@@ -146,35 +285,27 @@ class StandConsole(cmd.Cmd):
                     current = self.config_manager.get(section, key)
                     options.append(current)
                 # Add context-specific suggestions
-                if key == 'port':
-                    import serial.tools.list_ports
-                    options.extend([p.device for p in serial.tools.list_ports.comports()])
-                elif key == 'baudrate':
-                    baudrates_str = self.config_manager.get('serial', 'baudrates', fallback='9600,19200,38400,57600,115200')
-                    options.extend(baudrates_str.split(','))
-                elif key in ('frequency', 'current_frequency'):
-                    options.extend(['1.0', '10.0', '50.0', '100.0', '200.0', '400.0'])
-                elif key == 'max_frequency':
-                    options.extend(['100.0', '200.0', '400.0', '480.0', '1000.0'])
-                elif key == 'step':
-                    options.extend(['0.1', '0.2', '0.5', '1.0', '2.0', '5.0'])
-                elif key == 'duration':
-                    options.extend(['1.0', '5.0', '10.0', '20.0', '30.0', '60.0'])
-                elif key in ('ir_delay', 'loop_sleep'):
-                    options.extend(['5.0', '10.0', '15.0', '20.0', '30.0'])
-                elif key == 'max_loops_per_run':
-                    options.extend(['50', '100', '200', '500', '1000'])
-                elif key == 'sample_rate':
-                    options.extend(['22050', '44100', '48000', '96000'])
-                elif key == 'log_file':
-                    options.extend(['stand.log', 'experiment.log'])
+                source = self._value_sources.get(key)
+                options.extend(source() if source else _VALUE_SUGGESTIONS.get(key, ()))
                 return [opt for opt in options if opt.startswith(text)]
         return []
 
+    def _port_suggestions(self) -> List[str]:
+        """Return available serial ports."""
+        # Enumerating USB devices is slow, reuse the list for a few seconds
+        now = time.monotonic()
+        if now - self._ports_cache[0] > 2.0:
+            self._ports_cache = (now, [p.device for p in list_ports.comports()])
+        return self._ports_cache[1]
+
+    def _baudrate_suggestions(self) -> List[str]:
+        """Return configured baud rates."""
+        baudrates_str = self.config_manager.get('serial', 'baudrates', fallback='9600,19200,38400,57600,115200')
+        return baudrates_str.split(',')
+
     def complete_help(self, text, line, begidx, endidx):
         """Autocomplete for help command."""
-        commands = [name[3:] for name in dir(self) if name.startswith('do_')]
-        return [cmd for cmd in commands if cmd.startswith(text)]
+        return _prefix_matches(self._cmd_names, text)
 
     # Exit commands
     def do_quit(self, arg: str) -> bool:
@@ -197,12 +328,41 @@ class StandConsole(cmd.Cmd):
         """Do nothing on empty input."""
         pass
 
+    def parseline(self, line: str):
+        """Split line into (command, argument, line) with one regex match."""
+        line = line.strip()
+        if not line:
+            return None, None, line
+        if line[0] == '?':
+            line = 'help ' + line[1:]
+        elif line[0] == '!':
+            if 'shell' not in self._cmd_table:
+                return None, None, line
+            line = 'shell ' + line[1:]
+        cmd_name, arg = _COMMAND_RE.match(line).groups()
+        return cmd_name, arg, line
+
+    def onecmd(self, line: str) -> bool:
+        """Dispatch through the command table instead of a getattr per line."""
+        cmd_name, arg, line = self.parseline(line)
+        if not line:
+            return self.emptyline()
+        if not cmd_name:
+            return self.default(line)
+        self.lastcmd = '' if line == 'EOF' else line
+        func = self._cmd_table.get(cmd_name)
+        if func is None:
+            return self.default(line)
+        return func(arg)
+
+    def get_names(self) -> List[str]:
+        """Return do_* attribute names from the command table."""
+        return ['do_' + name for name in self._cmd_names]
+
     def completenames(self, text, *ignored):
         """Override to include dynamically registered commands."""
-        dotext = 'do_' + text
-        # Include both class and instance attributes
-        names = [name for name in dir(self) if name.startswith(dotext)]
-        return [name[3:] for name in names]
+        # Cached at init from both class and instance attributes
+        return _prefix_matches(self._cmd_names, text)
 
     def do_help(self, arg: str) -> None:
         """Show help for commands. Usage: help [command]"""
@@ -214,93 +374,4 @@ class StandConsole(cmd.Cmd):
                 print(f"  Unknown command: {arg}")
             return
 
-        print("""
-Stand - Arduino IR Lamp Controller
-===================================
-(Auto-connects to Arduino on startup using config settings)
-
-CONFIGURATION:
-  config        Display current configuration from stand.conf.
-
-  set <section>.<key> <value>
-                Set a configuration value and save to stand.conf.
-                Examples: set serial.port /dev/ttyACM0
-                          set serial.baudrate 115200
-                          set commands.ir_engage !r\\n
-
-SERIAL CONNECTION:
-  disconnect    Close the serial connection to Arduino.
-
-  test          Send IR command to Arduino and play confirmation sound.
-
-DEVICE CONTROL:
-  ir            Engage the IR lamp by sending command to Arduino.
-
-  sound [freq] [duration]
-                Generate and play a sine wave sound.
-                Examples: sound              # Use defaults from config
-                          sound 440          # 440 Hz with default duration
-                          sound 880 0.5      # 880 Hz for 0.5 seconds
-
-STATE MACHINE (controls frequency loop):
-  state         Show current state of the system.
-                States: idle, ready, running, paused, stopped
-
-  transitions   List available state transitions from current state.
-
-  start         Start frequency loop (ready -> running)
-                Plays 1 Hz -> 400 Hz, incrementing by 0.1 Hz each second.
-                Frequency saved to config after each cycle.
-
-  pause         Pause loop without saving (running -> paused)
-
-  resume        Resume loop from current frequency (paused/stopped -> running)
-
-  stop          Stop loop without saving (running/paused -> stopped)
-
-  reset         Reset state to idle (from any state)
-
-CAMERA:
-  sync          Sync camera time with host computer using gphoto2.
-
-  fetch [dir]   Fetch photos from mounted camera filesystem and rename.
-                Copies from DCIM folder to ./photos/ by default, then
-                prompts to rename as <frequency>-<timestamp>.<extension>
-
-  missing       Show frequencies missing from fetched videos.
-                Compares files in output directory against expected range.
-
-  rerun         Loop through only the missing frequencies.
-                Plays sound and triggers IR for each missing frequency.
-
-OTHER:
-  help [cmd]    Show this help or help for specific command.
-  quit, exit    Exit the application.
-
-TYPICAL WORKFLOW:
-  1. test                  # Verify connection (plays sound)
-  2. sync                  # Sync camera time (optional)
-  3. ir                    # Engage IR lamp
-  4. start                 # Start frequency sweep loop
-  5. pause / resume        # Control loop as needed
-  6. stop                  # Stop without saving progress
-
-CONFIG FILE (stand.conf):
-  [serial]
-  port = /dev/ttyUSB0      # Default serial port
-  baudrate = 9600          # Serial baud rate
-
-  [commands]
-  ir_engage = !r\\n         # Command to engage IR lamp
-
-  [sound]
-  frequency = 440          # Default frequency in Hz
-  duration = 1.0           # Default duration in seconds
-  sample_rate = 44100      # Audio sample rate
-
-  [loop]
-  current_frequency = 1.0  # Current/resume frequency
-  max_frequency = 400.0    # Maximum frequency
-  step = 0.1               # Frequency increment per cycle
-  duration = 1.0           # Duration of each tone
-""")
+        sys.stdout.write(_HELP_TEXT)
@@ -1,6 +1,7 @@
 """Thread-safe serial port handler."""
 
 import threading
+import time
 from typing import Optional, TYPE_CHECKING
 
 import serial
@@ -13,15 +14,21 @@ class SerialHandler:
     """Thread-safe serial port management."""
 
     def __init__(self, config: 'ConfigManager'):
+        # Lifecycle lock for connect/disconnect/reconnect; I/O takes the
+        # direction locks below so a blocked read never stalls a write
         self._lock = threading.Lock()
+        self._rx_lock = threading.Lock()
+        self._tx_lock = threading.Lock()
         self._port: Optional[serial.Serial] = None
         self._config = config
+        self._rx_buffer = bytearray()
 
     @property
     def is_connected(self) -> bool:
         """Check if port is open."""
-        with self._lock:
-            return self._port is not None and self._port.is_open
+        # Lock-free: _port is only ever rebound to a fully constructed Serial
+        port = self._port
+        return port is not None and port.is_open
 
     @property
     def port(self) -> Optional[serial.Serial]:
@@ -39,13 +46,21 @@ class SerialHandler:
 
             try:
                 print(f"  [SERIAL] Opening port {port} at {baudrate} baud...")
-                self._port = serial.Serial(port, baudrate, timeout=1)
+                self._port = serial.Serial(port, baudrate, timeout=self._config.serial_timeout)
+                self._enable_low_latency()
                 print(f"  [SERIAL] Connected successfully")
                 return True
             except serial.SerialException as e:
                 print(f"  [SERIAL] Warning: Could not connect to {port}: {e}")
                 return False
 
+    def _enable_low_latency(self) -> None:
+        """Set ASYNC_LOW_LATENCY on the port where the driver supports it."""
+        try:
+            self._port.set_low_latency_mode(True)
+        except (AttributeError, NotImplementedError, ValueError, OSError):
+            pass
+
     def disconnect(self) -> None:
         """Close serial connection."""
         with self._lock:
@@ -62,6 +77,17 @@ class SerialHandler:
         with self._lock:
             port = self._config.serial_port
             baudrate = self._config.baudrate
+            timeout = self._config.serial_timeout
+
+            # Reopening costs a termios round-trip; skip it when port and baud are
+            # unchanged, applying a changed read timeout to the live port instead
+            current = self._port
+            if (current and current.is_open and current.port == port
+                    and current.baudrate == baudrate):
+                if current.timeout != timeout:
+                    current.timeout = timeout
+                print(f"  [SERIAL] Already connected to {port} at {baudrate} baud")
+                return True
 
             if self._port and self._port.is_open:
                 print(f"  [SERIAL] Closing existing connection...")
@@ -69,43 +95,84 @@ class SerialHandler:
 
             try:
                 print(f"  [SERIAL] Opening port {port} at {baudrate} baud...")
-                self._port = serial.Serial(port, baudrate, timeout=1)
+                self._port = serial.Serial(port, baudrate, timeout=timeout)
+                self._enable_low_latency()
                 print(f"  [SERIAL] Reconnected successfully")
                 return True
             except serial.SerialException as e:
                 print(f"  [SERIAL] Error: {e}")
                 return False
 
+    def set_timeout(self, timeout: float) -> None:
+        """Change the port read timeout; pyserial reconfigures the tty on each change."""
+        with self._lock:
+            if self._port and self._port.is_open and self._port.timeout != timeout:
+                self._port.timeout = timeout
+
     def write(self, data: bytes) -> bool:
         """Thread-safe write. Returns success status."""
-        with self._lock:
-            if not self._port or not self._port.is_open:
-                return False
+        port = self._port
+        if not port or not port.is_open:
+            return False
+        with self._tx_lock:
             try:
-                self._port.write(data)
+                port.write(data)
                 return True
-            except serial.SerialException:
+            except (serial.SerialException, OSError, TypeError):
+                # Port closed underneath us by disconnect/reconnect
                 return False
 
     def readline(self, timeout: float = 1.0) -> Optional[str]:
         """Thread-safe read line."""
-        with self._lock:
-            if not self._port or not self._port.is_open:
-                return None
+        port = self._port
+        if not port or not port.is_open:
+            return None
+        with self._rx_lock:
             try:
-                old_timeout = self._port.timeout
-                self._port.timeout = timeout
-                line = self._port.readline().decode().strip()
-                self._port.timeout = old_timeout
+                end = self._fill_line(port, time.monotonic() + timeout)
+                with memoryview(self._rx_buffer)[:end] as view:
+                    # Undecodable bytes are dropped; a strict decode (the old behavior)
+                    # raised and left the line buffered, wedging every later read
+                    line = str(view, 'utf-8', 'ignore').strip()
+                del self._rx_buffer[:end]
                 return line
-            except serial.SerialException:
+            except (serial.SerialException, OSError, TypeError):
+                # Port closed underneath us by disconnect/reconnect
                 return None
 
+    def _fill_line(self, port: serial.Serial, deadline: float) -> int:
+        """Buffer up to one line, taking all waiting bytes in each read call.
+
+        Reads use the port's own timeout and stop once the monotonic deadline
+        passes, so the port is never reconfigured per call. Returns the line
+        length in the receive buffer; bytes past it stay buffered for the
+        next call. Caller must hold the RX lock.
+        """
+        limit = self._config.expected_reply_bytes
+        buf = self._rx_buffer
+        while True:
+            newline = buf.find(b'\n')
+            if newline >= 0:
+                end = newline + 1
+                break
+            if len(buf) >= limit:
+                end = limit
+                break
+            chunk = port.read(port.in_waiting or 1)
+            if chunk:
+                buf += chunk
+            elif time.monotonic() >= deadline:
+                end = len(buf)
+                break
+        return end
+
     def reset_input_buffer(self) -> None:
         """Clear input buffer."""
-        with self._lock:
-            if self._port and self._port.is_open:
-                self._port.reset_input_buffer()
+        port = self._port
+        with self._rx_lock:
+            if port and port.is_open:
+                port.reset_input_buffer()
+            self._rx_buffer.clear()
 
     def send_ir_command(self) -> bool:
         """Send IR command from config. Returns success."""
@@ -1,18 +1,27 @@
 """State machine for command execution states."""
 
-import threading
-from typing import List
+import sys
+from typing import List, Optional
 
 from transitions import Machine
 
 
+def _quiet() -> None:
+    """Stand-in for on_enter_* callbacks when output is not a terminal."""
+
+
 class CommandStateMachine:
     """Thread-safe state machine managing command execution states."""
 
     states: List[str] = ['idle', 'ready', 'running', 'paused', 'stopped']
 
-    def __init__(self):
-        self._lock = threading.RLock()
+    def __init__(self, verbose: Optional[bool] = None):
+        # Transition announcements only make sense on an interactive terminal
+        if verbose is None:
+            verbose = sys.stdout.isatty()
+        if not verbose:
+            for state in CommandStateMachine.states:
+                setattr(self, f'on_enter_{state}', _quiet)
         self.machine = Machine(
             model=self,
             states=CommandStateMachine.states,
@@ -28,17 +37,24 @@ class CommandStateMachine:
         self.machine.add_transition(trigger='stop', source=['running', 'paused'], dest='stopped')
         self.machine.add_transition(trigger='reset', source='*', dest='idle')
 
+        # Transition table is fixed from here on, so triggers per state are too
+        self._triggers_by_state = {
+            name: tuple(self.machine.get_triggers(name)) for name in CommandStateMachine.states
+        }
+
     @property
     def current_state(self) -> str:
         """Thread-safe state access."""
-        with self._lock:
-            return self.state
+        # A single attribute read; transitions rebind it atomically
+        return self.state
 
     def get_triggers(self, state: str = None) -> List[str]:
         """Get available triggers from current or specified state."""
-        with self._lock:
-            target_state = state if state else self.state
+        target_state = state if state else self.state
+        triggers = self._triggers_by_state.get(target_state)
+        if triggers is None:
             return self.machine.get_triggers(target_state)
+        return list(triggers)
 
     def on_enter_idle(self):
         print("  [State] Entered idle state")
@@ -6,10 +6,10 @@ import sys
 import threading
 import time
 from collections import deque
-from typing import Callable, Optional, TYPE_CHECKING
+from dataclasses import dataclass
+from typing import Callable, Optional, TextIO, TYPE_CHECKING
 
-import numpy as np
-import sounddevice as sd
+from .audio import fill_tone, open_stream, tone_buffer
 
 if TYPE_CHECKING:
     from .config import ConfigManager
@@ -17,36 +17,55 @@ if TYPE_CHECKING:
     from .state_machine import CommandStateMachine
 
 
+# Samples per stream.write call; bounds how long a stop request waits
+WRITE_BLOCK = 4096
+
+# Default loop iterations between writes of current_frequency to the config file
+SAVE_EVERY = 10
+
+
 class OutputPrinter:
     """Thread-safe console output with readline preservation."""
 
-    def __init__(self, prompt: str, lock: threading.Lock):
-        self._lock = lock
+    def __init__(self, prompt: str):
         self._prompt = prompt
+        # Prompt repaint only makes sense when a user is typing at a terminal
+        self._is_tty = sys.stdout.isatty()
 
     def print_line(self, message: str) -> None:
-        """Print message preserving readline buffer."""
-        with self._lock:
-            sys.stdout.write(f"\r{message}\n{self._prompt}")
+        """Print message preserving readline buffer.
+
+        Message, prompt and pending input go out in one write, which the
+        buffered stdout applies atomically, so threads need no shared lock.
+        """
+        if not self._is_tty:
+            # Piped stdout is block-buffered; flush so worker lines show up now
+            sys.stdout.write(f"{message}\n")
             sys.stdout.flush()
-            try:
-                line = readline.get_line_buffer()
-                if line:
-                    sys.stdout.write(line)
-                    sys.stdout.flush()
-            except Exception:
-                pass
+            return
+        try:
+            line = readline.get_line_buffer()
+        except Exception:
+            line = ''
+        sys.stdout.write(f"\r{message}\n{self._prompt}{line}")
+        sys.stdout.flush()
 
 
 def format_time(seconds: float) -> str:
     """Format seconds as HH:MM:SS or MM:SS."""
     if seconds < 0:
         return "--:--"
-    hours, remainder = divmod(int(seconds), 3600)
-    minutes, secs = divmod(remainder, 60)
-    if hours > 0:
-        return f"{hours}:{minutes:02d}:{secs:02d}"
-    return f"{minutes:02d}:{secs:02d}"
+    minutes, secs = divmod(int(seconds), 60)
+    if minutes < 60:
+        return f"{minutes:02d}:{secs:02d}"
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}:{minutes:02d}:{secs:02d}"
+
+
+def format_clock(seconds_from_now: float, now: Optional[float] = None) -> str:
+    """Format the local wall-clock time seconds_from_now ahead as HH:MM."""
+    lt = time.localtime((time.time() if now is None else now) + seconds_from_now)
+    return f"{lt.tm_hour:02d}:{lt.tm_min:02d}"
 
 
 def format_progress(
@@ -71,17 +90,44 @@ def format_progress(
     time_left_run = loops_left_run * time_per_iter
     time_left_total = total_loops_left * time_per_iter
 
-    now = datetime.datetime.now()
-    eta_run = now + datetime.timedelta(seconds=time_left_run)
-    eta_total = now + datetime.timedelta(seconds=time_left_total)
-
+    now = time.time()
     progress = (
-        f"Run: {loop_count}/{max_loops_per_run} ({format_time(time_left_run)} remaining, ends at {eta_run.strftime('%H:%M')}) | "
-        f"Total: {total_loops_left} left ({format_time(time_left_total)} remaining, ends at {eta_total.strftime('%H:%M')})"
+        f"Run: {loop_count}/{max_loops_per_run} ({format_time(time_left_run)} remaining, ends at {format_clock(time_left_run, now)}) | "
+        f"Total: {total_loops_left} left ({format_time(time_left_total)} remaining, ends at {format_clock(time_left_total, now)})"
     )
     return progress
 
 
+@dataclass(frozen=True)
+class LoopSettings:
+    """Loop parameters read from config once per run."""
+
+    sample_rate: int
+    max_freq: float
+    step: float
+    duration: float
+    loop_sleep: float
+    max_loops_per_run: int
+    ir_delay: float
+    log_file: str
+    save_every: int
+
+    @classmethod
+    def from_config(cls, config: 'ConfigManager') -> 'LoopSettings':
+        """Read all loop settings in a single pass."""
+        return cls(
+            sample_rate=config.getint('sound', 'sample_rate', fallback=44100),
+            max_freq=config.getfloat('loop', 'max_frequency', fallback=400.0),
+            step=config.getfloat('loop', 'step', fallback=0.25),
+            duration=config.getfloat('loop', 'duration', fallback=1.0),
+            loop_sleep=config.getfloat('loop', 'loop_sleep', fallback=10.0),
+            max_loops_per_run=config.getint('loop', 'max_loops_per_run', fallback=250),
+            ir_delay=config.getfloat('loop', 'ir_delay', fallback=10.0),
+            log_file=config.get('loop', 'log_file', fallback='stand.log'),
+            save_every=max(1, config.getint('loop', 'save_every', fallback=SAVE_EVERY)),
+        )
+
+
 class LoopWorker:
     """Background worker for frequency sweep loop."""
 
@@ -123,90 +169,108 @@ class LoopWorker:
 
     def _run(self) -> None:
         """Main loop implementation."""
-        sample_rate = self._config.getint('sound', 'sample_rate', fallback=44100)
-        max_freq = self._config.getfloat('loop', 'max_frequency', fallback=400.0)
-        step = self._config.getfloat('loop', 'step', fallback=0.25)
-        duration = self._config.getfloat('loop', 'duration', fallback=1.0)
-        loop_sleep = self._config.getfloat('loop', 'loop_sleep', fallback=10.0)
-        max_loops_per_run = self._config.getint('loop', 'max_loops_per_run', fallback=250)
+        cfg = LoopSettings.from_config(self._config)
+        frequency = self._config.getfloat('loop', 'current_frequency', fallback=1.0)
         loop_count = 0
+        unsaved_steps = 0
+        next_tone = None
+
+        # Write-based stream owned by this thread, kept open across tones
+        try:
+            stream = open_stream(cfg.sample_rate)
+        except Exception as e:
+            print(f"  Loop error: {e}")
+            return
+
+        # Every tone has the same length: alternate two preallocated buffers,
+        # one playing while the next tone is rendered into the other
+        n_samples = int(cfg.sample_rate * cfg.duration)
+        play_buf, next_buf = tone_buffer(n_samples), tone_buffer(n_samples)
+        scratch = tone_buffer(n_samples)
+
+        try:
+            while not self._stop_event.is_set():
+                if frequency > cfg.max_freq:
+                    print(f"  Loop completed (reached {cfg.max_freq} Hz)")
+                    break
 
-        while not self._stop_event.is_set():
-            frequency = self._config.getfloat('loop', 'current_frequency', fallback=1.0)
-
-            if frequency > max_freq:
-                print(f"  Loop completed (reached {max_freq} Hz)")
-                break
+                if loop_count >= cfg.max_loops_per_run:
+                    print(f"  Loop paused after {cfg.max_loops_per_run} iterations (use 'resume' to continue)")
+                    try:
+                        self._state_machine.pause()
+                    except Exception:
+                        pass
+                    if self._on_pause:
+                        self._on_pause()
+                    break
 
-            if loop_count >= max_loops_per_run:
-                print(f"  Loop paused after {max_loops_per_run} iterations (use 'resume' to continue)")
                 try:
-                    self._state_machine.pause()
-                except Exception:
-                    pass
-                if self._on_pause:
-                    self._on_pause()
-                break
-
-            try:
-                self.history.append(f"{frequency:.1f} Hz")
+                    self.history.append(f"{frequency:.1f} Hz")
 
-                # Format progress info
-                progress = format_progress(
-                    frequency, loop_count, max_freq, step,
-                    duration, loop_sleep, max_loops_per_run
-                )
+                    # Format progress info
+                    progress = format_progress(
+                        frequency, loop_count, cfg.max_freq, cfg.step,
+                        cfg.duration, cfg.loop_sleep, cfg.max_loops_per_run
+                    )
 
-                self._printer.print_line(f"  ♪ {frequency:.2f} Hz | {progress}")
+                    self._printer.print_line(f"  ♪ {frequency:.2f} Hz | {progress}")
 
-                # Signal IR thread that iteration started
-                self._ir_trigger.set()
+                    # Signal IR thread that iteration started
+                    self._ir_trigger.set()
 
-                # Streaming audio playback
-                phase = [0.0]
-                total_samples = int(sample_rate * duration)
-                samples_played = [0]
+                    # Write the tone in blocks so stop is noticed between writes
+                    if next_tone is not None and next_tone[0] == frequency:
+                        wave = next_tone[1]
+                        play_buf, next_buf = next_buf, play_buf
+                    else:
+                        wave = fill_tone(frequency, n_samples, cfg.sample_rate, play_buf, scratch).reshape(-1, 1)
+                    next_tone = None
+                    next_frequency = frequency + cfg.step
+                    prefetch = next_frequency <= cfg.max_freq
+                    for start in range(0, len(wave), WRITE_BLOCK):
+                        if self._stop_event.is_set():
+                            break
+                        stream.write(wave[start:start + WRITE_BLOCK])
+                        if prefetch:
+                            # Synthesize the next tone while this one plays
+                            next_wave = fill_tone(next_frequency, n_samples, cfg.sample_rate, next_buf, scratch)
+                            next_tone = (next_frequency, next_wave.reshape(-1, 1))
+                            prefetch = False
 
-                def audio_callback(outdata, frames, time_info, status):
                     if self._stop_event.is_set():
-                        raise sd.CallbackStop()
-                    for i in range(frames):
-                        if samples_played[0] >= total_samples:
-                            outdata[i:] = 0
-                            raise sd.CallbackStop()
-                        phase[0] += 2 * np.pi * frequency / sample_rate
-                        outdata[i] = 0.5 * np.sin(phase[0])
-                        samples_played[0] += 1
-
-                with sd.OutputStream(samplerate=sample_rate, channels=1,
-                                     callback=audio_callback, blocksize=2048):
-                    while samples_played[0] < total_samples and not self._stop_event.is_set():
-                        time.sleep(0.1)
-
-                if self._stop_event.is_set():
-                    break
+                        break
 
-                # Increment and save frequency
-                frequency += step
-                self._config.set('loop', 'current_frequency', str(frequency))
-                if self._save_on_stop:
-                    self._config.save()
+                    # Increment and save frequency
+                    frequency = next_frequency
+                    self._config.set('loop', 'current_frequency', str(frequency))
+                    unsaved_steps += 1
+                    if self._save_on_stop and unsaved_steps >= cfg.save_every:
+                        self._config.save()
+                        unsaved_steps = 0
 
-                # Delay message
-                self._printer.print_line(f"  zzz sleeping {loop_sleep:.0f}s...")
+                    # Delay message
+                    self._printer.print_line(f"  zzz sleeping {cfg.loop_sleep:.0f}s...")
 
-                # Interruptible sleep
-                sleep_iterations = int(loop_sleep * 10)
-                for _ in range(sleep_iterations):
-                    if self._stop_event.is_set():
+                    # Interruptible sleep, returns as soon as stop is requested
+                    if self._stop_event.wait(cfg.loop_sleep):
                         break
-                    time.sleep(0.1)
 
-                loop_count += 1
+                    loop_count += 1
 
-            except Exception as e:
-                print(f"  Loop error: {e}")
-                break
+                except Exception as e:
+                    print(f"  Loop error: {e}")
+                    break
+        finally:
+            # On stop, drop queued audio; otherwise let the last tone finish
+            if self._stop_event.is_set():
+                stream.abort()
+            else:
+                stream.stop()
+            stream.close()
+            # Completed steps are always persisted; save=False only means the
+            # interrupted step is not advanced, which never reaches the config
+            if unsaved_steps:
+                self._config.save()
 
 
 class IRWorker:
@@ -247,34 +311,51 @@ class IRWorker:
 
     def _run(self) -> None:
         """IR worker loop."""
+        cfg = LoopSettings.from_config(self._config)
+        # One line-buffered log handle for the run instead of an open per IR fire
+        try:
+            log_fh = open(cfg.log_file, 'a', buffering=1)
+        except OSError:
+            log_fh = None
+
+        try:
+            self._loop(cfg, log_fh)
+        finally:
+            if log_fh is not None:
+                log_fh.close()
+
+    def _loop(self, cfg: LoopSettings, log_fh: Optional[TextIO]) -> None:
+        """Send one IR command per trigger until stopped."""
+        # Command bytes are fixed for the run; edits apply from the next start
+        cmd = self._config.ir_command
         while not self._stop_event.is_set():
             # Wait for signal from sound loop
             self._ir_trigger.wait()
             if self._stop_event.is_set():
                 break
+            # Triggers that arrive while busy collapse into this one
             self._ir_trigger.clear()
 
-            # Wait before sending IR
-            ir_delay = self._config.getfloat('loop', 'ir_delay', fallback=10.0)
-            time.sleep(ir_delay)
-            if self._stop_event.is_set():
+            # Only a running loop warrants an IR; check before the delay and
+            # again before sending, since the loop may pause in between
+            if self._state_machine.current_state != 'running':
+                return
+
+            # Wait before sending IR; returns as soon as stop is requested
+            if self._stop_event.wait(cfg.ir_delay):
                 break
+            if self._state_machine.current_state != 'running':
+                return
 
             # Send IR command
             if self._serial.is_connected:
                 try:
-                    cmd = self._config.ir_command
                     success = self._serial.write(cmd)
                     if success:
                         frequency = self._config.getfloat('loop', 'current_frequency', fallback=0)
-                        # Log IR command only if properly initialized
-                        if self._state_machine.state != 'running':
-                            return
-
-                        log_file = self._config.get('loop', 'log_file', fallback='stand.log')
                         try:
-                            with open(log_file, 'a') as f:
-                                f.write(f"{datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')}: {frequency:.1f}\n")
+                            if log_fh is not None:
+                                log_fh.write(f"{datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')}: {frequency:.1f}\n")
                         except Exception:
                             pass
                         self._printer.print_line(f"  -> IR sent @ {frequency:.2f} Hz")
@@ -294,7 +375,6 @@ class WorkerManager:
         config: 'ConfigManager',
         serial_handler: 'SerialHandler',
         state_machine: 'CommandStateMachine',
-        output_lock: threading.Lock,
         prompt: str,
     ):
         self._config = config
@@ -302,7 +382,7 @@ class WorkerManager:
         self._state_machine = state_machine
         self._stop_event = threading.Event()
         self._ir_trigger = threading.Event()
-        self._printer = OutputPrinter(prompt, output_lock)
+        self._printer = OutputPrinter(prompt)
 
         self._loop_worker = LoopWorker(
             config=config,
@@ -324,7 +404,8 @@ class WorkerManager:
     def start(self, save_on_stop: bool = True) -> None:
         """Start both workers."""
         # Stop any existing workers first
-        self.stop(save=True)
+        if self._loop_worker.is_running or self._ir_worker.is_running:
+            self.stop(save=True)
 
         # Reset events
         self._stop_event.clear()